@@ -3,6 +3,7 @@ Tools for the Hotel Agent.
 """
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+from types import MappingProxyType
 import asyncio
 import random
 import logging
@@ -12,6 +13,112 @@ from ...shared.utils import calculate_distance, rank_options
 
 logger = logging.getLogger(__name__)
 
+# Shared RNG for the stateless validator; seed it in tests for determinism
+_VRNG = random.Random()
+
+
+def _freeze_catalog(catalog: Dict[str, List[Dict[str, Any]]]) -> Dict[str, tuple]:
+    """Make the catalog read-only so it can be shared without copying."""
+    return {
+        city: tuple(
+            MappingProxyType({
+                **hotel,
+                "amenities": tuple(hotel["amenities"]),
+                "room_types": tuple(hotel["room_types"]),
+            })
+            for hotel in hotels
+        )
+        for city, hotels in catalog.items()
+    }
+
+
+# Mock hotel data, frozen once at import
+_MOCK_HOTELS = _freeze_catalog({
+    "New York": [
+        {
+            "name": "The Plaza Hotel",
+            "latitude": 40.7644,
+            "longitude": -73.9745,
+            "address": "768 5th Ave, New York, NY 10019",
+            "price_per_night": 450,
+            "rating": 4.7,
+            "amenities": ["WiFi", "Spa", "Gym", "Restaurant", "Bar"],
+            "room_types": ["Deluxe Room", "Suite", "Presidential Suite"],
+            "cancellation_policy": "Free cancellation up to 24 hours"
+        },
+        {
+            "name": "Hilton Times Square",
+            "latitude": 40.7628,
+            "longitude": -73.9857,
+            "address": "234 W 42nd St, New York, NY 10036",
+            "price_per_night": 280,
+            "rating": 4.3,
+            "amenities": ["WiFi", "Gym", "Restaurant", "Business Center"],
+            "room_types": ["Standard Room", "Executive Room"],
+            "cancellation_policy": "Free cancellation up to 48 hours"
+        },
+        {
+            "name": "Pod Times Square",
+            "latitude": 40.7614,
+            "longitude": -73.9866,
+            "address": "400 W 42nd St, New York, NY 10036",
+            "price_per_night": 150,
+            "rating": 4.1,
+            "amenities": ["WiFi", "Rooftop Bar"],
+            "room_types": ["Pod Room", "Bunk Pod"],
+            "cancellation_policy": "Non-refundable"
+        }
+    ],
+    "Paris": [
+        {
+            "name": "Four Seasons Hotel George V",
+            "latitude": 48.8689,
+            "longitude": 2.3008,
+            "address": "31 Av. George V, 75008 Paris",
+            "price_per_night": 850,
+            "rating": 4.9,
+            "amenities": ["WiFi", "Spa", "Gym", "Michelin Restaurant", "Concierge"],
+            "room_types": ["Superior Room", "Deluxe Suite", "Penthouse"],
+            "cancellation_policy": "Free cancellation up to 7 days"
+        },
+        {
+            "name": "Hotel des Grands Boulevards",
+            "latitude": 48.8715,
+            "longitude": 2.3437,
+            "address": "17 Bd Poissonnière, 75002 Paris",
+            "price_per_night": 220,
+            "rating": 4.5,
+            "amenities": ["WiFi", "Restaurant", "Bar", "Room Service"],
+            "room_types": ["Cosy Room", "Deluxe Room"],
+            "cancellation_policy": "Free cancellation up to 48 hours"
+        }
+    ],
+    "Tokyo": [
+        {
+            "name": "Park Hyatt Tokyo",
+            "latitude": 35.6857,
+            "longitude": 139.6907,
+            "address": "3-7-1-2 Nishi Shinjuku, Tokyo",
+            "price_per_night": 600,
+            "rating": 4.8,
+            "amenities": ["WiFi", "Spa", "Pool", "Gym", "Multiple Restaurants"],
+            "room_types": ["Park Room", "View Room", "Suite"],
+            "cancellation_policy": "Free cancellation up to 24 hours"
+        },
+        {
+            "name": "Hotel Gracery Shinjuku",
+            "latitude": 35.6951,
+            "longitude": 139.7029,
+            "address": "1-19-1 Kabukicho, Shinjuku, Tokyo",
+            "price_per_night": 180,
+            "rating": 4.2,
+            "amenities": ["WiFi", "Restaurant", "Godzilla View"],
+            "room_types": ["Standard Room", "Godzilla Room"],
+            "cancellation_policy": "Free cancellation up to 24 hours"
+        }
+    ]
+})
+
 
 class HotelSearchAPI:
     """Mock hotel search API for development."""
@@ -19,100 +126,18 @@ class HotelSearchAPI:
     def __init__(self, api_config: Dict[str, Any]):
         self.api_key = api_config.get("api_key", "mock_key")
         self.base_url = api_config.get("base_url", "https://api.hotels.mock")
+        self._rng = random.Random(api_config.get("random_seed"))
         
-        # Mock hotel data for demonstration
-        self.mock_hotels = {
-            "New York": [
-                {
-                    "name": "The Plaza Hotel",
-                    "latitude": 40.7644,
-                    "longitude": -73.9745,
-                    "address": "768 5th Ave, New York, NY 10019",
-                    "price_per_night": 450,
-                    "rating": 4.7,
-                    "amenities": ["WiFi", "Spa", "Gym", "Restaurant", "Bar"],
-                    "room_types": ["Deluxe Room", "Suite", "Presidential Suite"],
-                    "cancellation_policy": "Free cancellation up to 24 hours"
-                },
-                {
-                    "name": "Hilton Times Square",
-                    "latitude": 40.7628,
-                    "longitude": -73.9857,
-                    "address": "234 W 42nd St, New York, NY 10036",
-                    "price_per_night": 280,
-                    "rating": 4.3,
-                    "amenities": ["WiFi", "Gym", "Restaurant", "Business Center"],
-                    "room_types": ["Standard Room", "Executive Room"],
-                    "cancellation_policy": "Free cancellation up to 48 hours"
-                },
-                {
-                    "name": "Pod Times Square",
-                    "latitude": 40.7614,
-                    "longitude": -73.9866,
-                    "address": "400 W 42nd St, New York, NY 10036",
-                    "price_per_night": 150,
-                    "rating": 4.1,
-                    "amenities": ["WiFi", "Rooftop Bar"],
-                    "room_types": ["Pod Room", "Bunk Pod"],
-                    "cancellation_policy": "Non-refundable"
-                }
-            ],
-            "Paris": [
-                {
-                    "name": "Four Seasons Hotel George V",
-                    "latitude": 48.8689,
-                    "longitude": 2.3008,
-                    "address": "31 Av. George V, 75008 Paris",
-                    "price_per_night": 850,
-                    "rating": 4.9,
-                    "amenities": ["WiFi", "Spa", "Gym", "Michelin Restaurant", "Concierge"],
-                    "room_types": ["Superior Room", "Deluxe Suite", "Penthouse"],
-                    "cancellation_policy": "Free cancellation up to 7 days"
-                },
-                {
-                    "name": "Hotel des Grands Boulevards",
-                    "latitude": 48.8715,
-                    "longitude": 2.3437,
-                    "address": "17 Bd Poissonnière, 75002 Paris",
-                    "price_per_night": 220,
-                    "rating": 4.5,
-                    "amenities": ["WiFi", "Restaurant", "Bar", "Room Service"],
-                    "room_types": ["Cosy Room", "Deluxe Room"],
-                    "cancellation_policy": "Free cancellation up to 48 hours"
-                }
-            ],
-            "Tokyo": [
-                {
-                    "name": "Park Hyatt Tokyo",
-                    "latitude": 35.6857,
-                    "longitude": 139.6907,
-                    "address": "3-7-1-2 Nishi Shinjuku, Tokyo",
-                    "price_per_night": 600,
-                    "rating": 4.8,
-                    "amenities": ["WiFi", "Spa", "Pool", "Gym", "Multiple Restaurants"],
-                    "room_types": ["Park Room", "View Room", "Suite"],
-                    "cancellation_policy": "Free cancellation up to 24 hours"
-                },
-                {
-                    "name": "Hotel Gracery Shinjuku",
-                    "latitude": 35.6951,
-                    "longitude": 139.7029,
-                    "address": "1-19-1 Kabukicho, Shinjuku, Tokyo",
-                    "price_per_night": 180,
-                    "rating": 4.2,
-                    "amenities": ["WiFi", "Restaurant", "Godzilla View"],
-                    "room_types": ["Standard Room", "Godzilla Room"],
-                    "cancellation_policy": "Free cancellation up to 24 hours"
-                }
-            ]
-        }
+        # Mock hotel data for demonstration, shared by every instance
+        self.mock_hotels = _MOCK_HOTELS
     
     async def search(self, destination: str, check_in: datetime, check_out: datetime,
                     guests: int, max_price: float, min_rating: float = 3.0,
                     amenities: List[str] = None) -> List[Dict[str, Any]]:
         """Search for hotels."""
         # Simulate API delay
-        await asyncio.sleep(random.uniform(0.5, 1.5))
+        rng = self._rng
+        await asyncio.sleep(rng.uniform(0.5, 1.5))
         
         # Get base hotels for destination
         city_key = None
@@ -125,7 +150,7 @@ class HotelSearchAPI:
             # Return generic hotels for unknown destinations
             city_key = "New York"
         
-        hotels = self.mock_hotels[city_key].copy()
+        hotels = self.mock_hotels[city_key]
         
         # Calculate total price and filter
         nights = (check_out - check_in).days
@@ -133,7 +158,7 @@ class HotelSearchAPI:
         
         for hotel in hotels:
             # Add some price variation
-            price_variation = random.uniform(0.9, 1.1)
+            price_variation = rng.uniform(0.9, 1.1)
             price_per_night = hotel["price_per_night"] * price_variation
             
             # Apply filters
@@ -150,11 +175,12 @@ class HotelSearchAPI:
                     continue
             
             # Create result
-            result = hotel.copy()
+            result = dict(hotel)
+            result["amenities"] = list(hotel["amenities"])
             result["price_per_night"] = round(price_per_night, 2)
             result["total_price"] = round(price_per_night * nights, 2)
-            result["available_rooms"] = random.randint(1, 10)
-            result["room_type"] = random.choice(hotel["room_types"])
+            result["available_rooms"] = rng.randint(1, 10)
+            result["room_type"] = rng.choice(hotel["room_types"])
             
             results.append(result)
         
@@ -172,6 +198,28 @@ class HotelRanker:
             "amenities": 0.15,
             "cancellation": 0.05
         }
+        self._score_fn = self._build_score_fn(self.default_weights)
+        self._rng = random.Random()
+    
+    @staticmethod
+    def _build_score_fn(weights: Dict[str, float]):
+        """Build a weighted-sum scorer with the weights bound as locals."""
+        w_price = weights["price"]
+        w_rating = weights["rating"]
+        w_location = weights["location"]
+        w_amenities = weights["amenities"]
+        w_cancellation = weights["cancellation"]
+        
+        def score(scores: Dict[str, float]) -> float:
+            return (
+                scores["price"] * w_price
+                + scores["rating"] * w_rating
+                + scores["location"] * w_location
+                + scores["amenities"] * w_amenities
+                + scores["cancellation"] * w_cancellation
+            )
+        
+        return score
     
     async def rank_hotels(self, hotels: List[Dict[str, Any]], 
                          preferences: Dict[str, Any],
@@ -180,12 +228,19 @@ class HotelRanker:
         
         # Score each hotel
         scored_hotels = []
+        score_fn = self._score_fn
+        uniform = self._rng.uniform
+        
+        # Per-call invariants, computed once rather than per hotel
+        inv_budget = 1.0 / budget if budget > 0 else None
+        desired_amenities = frozenset(preferences.get("amenities", []))
+        desired_count = len(desired_amenities)
         
         for hotel in hotels:
             scores = {}
             
             # Price score (lower is better, normalized)
-            price_ratio = hotel["total_price"] / budget if budget > 0 else 1
+            price_ratio = hotel["total_price"] * inv_budget if inv_budget is not None else 1
             scores["price"] = max(0, 1 - price_ratio)
             
             # Rating score (normalized to 0-1)
@@ -193,13 +248,11 @@ class HotelRanker:
             
             # Location score (would use real distance calculation)
             # For now, use a random score
-            scores["location"] = random.uniform(0.6, 1.0)
+            scores["location"] = uniform(0.6, 1.0)
             
             # Amenities score
-            desired_amenities = set(preferences.get("amenities", []))
-            hotel_amenities = set(hotel.get("amenities", []))
-            if desired_amenities:
-                amenity_match = len(desired_amenities & hotel_amenities) / len(desired_amenities)
+            if desired_count:
+                amenity_match = len(desired_amenities.intersection(hotel.get("amenities", ()))) / desired_count
                 scores["amenities"] = amenity_match
             else:
                 scores["amenities"] = 0.5
@@ -211,10 +264,7 @@ class HotelRanker:
                 scores["cancellation"] = 0.3
             
             # Calculate weighted score
-            total_score = sum(
-                scores[criterion] * self.default_weights[criterion]
-                for criterion in self.default_weights
-            )
+            total_score = score_fn(scores)
             
             hotel_copy = hotel.copy()
             hotel_copy["_score"] = total_score
@@ -238,7 +288,7 @@ class HotelValidator:
         await asyncio.sleep(0.2)
         
         # Random availability for demonstration
-        if random.random() > 0.9:  # 10% chance of unavailable
+        if _VRNG.random() > 0.9:  # 10% chance of unavailable
             return False, "No rooms available for selected dates"
         
         if hotel.get("available_rooms", 1) < 1:
@@ -250,7 +300,27 @@ class HotelValidator:
             return False, f"Not enough rooms available. Need {rooms_needed} rooms."
         
         return True, None
-    
+
+    @staticmethod
+    async def validate_availability_many(hotels: List[Dict[str, Any]],
+                                         check_in: datetime,
+                                         check_out: datetime,
+                                         guests: int,
+                                         max_concurrency: int = 32) -> List[tuple[bool, Optional[str]]]:
+        """Validate availability for several hotels concurrently.
+
+        Results are returned in the same order as ``hotels``.
+        """
+        sem = asyncio.BoundedSemaphore(max_concurrency)
+
+        async def _bounded(hotel: Dict[str, Any]) -> tuple[bool, Optional[str]]:
+            async with sem:
+                return await HotelValidator.validate_availability(
+                    hotel, check_in, check_out, guests
+                )
+
+        return await asyncio.gather(*(_bounded(hotel) for hotel in hotels))
+
     @staticmethod
     def validate_checkin_time(hotel_checkin: str, arrival_time: datetime) -> tuple[bool, Optional[str]]:
         """Validate if check-in time works with arrival."""
@@ -24,7 +24,7 @@ from starlette.requests import Request
 from starlette.responses import JSONResponse
 
 from .agent_executor import ItineraryAgentExecutor
-from ...security.auth import security_manager, get_ssl_context, A2ASecurityMiddleware
+from ...security.auth import security_manager, get_ssl_context, A2ASecurityMiddleware, PUBLIC_PATHS, is_trusted_host
 
 
 load_dotenv()
@@ -119,13 +119,13 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         self.security = A2ASecurityMiddleware(service_id)
     
     async def dispatch(self, request: Request, call_next):
-        # Skip security for health check
-        if request.url.path == "/health":
+        # Skip security for public endpoints and trusted internal callers
+        client_host = request.client.host if request.client else None
+        if request.url.path in PUBLIC_PATHS or is_trusted_host(client_host):
             return await call_next(request)
         
         # Verify incoming request
-        headers = dict(request.headers)
-        is_valid, requester = await self.security.verify_incoming_request(headers)
+        is_valid, requester = await self.security.verify_incoming_request(request.headers)
         
         if not is_valid:
             return JSONResponse(
@@ -137,7 +137,7 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         request.state.requester = requester
         
         # Check rate limit
-        if not security_manager.check_rate_limit(requester or request.client.host):
+        if not security_manager.check_rate_limit(requester or client_host):
             return JSONResponse(
                 status_code=429,
                 content={"error": "Rate limit exceeded"}
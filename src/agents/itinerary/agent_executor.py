@@ -18,14 +18,14 @@ from a2a.types import (
 )
 from a2a.utils.errors import ServerError
 
-from .itinerary_agent_a2a import ItineraryAgentA2A
+from .itinerary_agent_a2a import get_itinerary_agent
 
 
 class ItineraryAgentExecutor(AgentExecutor):
     """A2A executor for Itinerary Agent."""
     
     def __init__(self):
-        self.agent = ItineraryAgentA2A()
+        self.agent = get_itinerary_agent()
     
     async def invoke(
         self,
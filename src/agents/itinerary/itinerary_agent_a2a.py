@@ -2,34 +2,109 @@
 Itinerary Agent implementation for A2A protocol.
 """
 import asyncio
-import json
-from typing import Any, AsyncIterable, Dict, List
+from collections import defaultdict
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, AsyncIterable, Dict, List, Optional
 from datetime import datetime, timedelta
 import uuid
 
+import orjson
 from langchain_core.messages import AIMessage, ToolMessage
 from langchain_core.tools import tool
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.prebuilt import create_react_agent
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 from ...shared.llm_config import LLMConfig
 
 
 memory = MemorySaver()
 
+# Compiled agent graphs keyed by agent name; shared across instances
+_GRAPH_CACHE: Dict[str, Any] = {}
+
+# Process-wide agent instance, see get_itinerary_agent()
+_singleton = None
+
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# Icons used in the rendered itinerary
+WARN = "⚠️"
+CAL = "📅"
+PIN = "📍"
+TICKET = "🎫"
+MONEY = "💰"
+MEMO = "📝"
+CASH = "💵"
+CLIPBOARD = "📋"
+DOCUMENT = "📄"
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize a tool result to a JSON string."""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(date_str: str) -> datetime:
+    """Parse a YYYY-MM-DD date, memoized across tool calls."""
+    return datetime.strptime(date_str, "%Y-%m-%d")
+
+
+def _fast_dt(date_str: str, time_str: str) -> datetime:
+    """Parse a YYYY-MM-DD date and HH:MM time by slicing, without strptime."""
+    if (
+        len(date_str) == 10 and date_str[4] == "-" and date_str[7] == "-"
+        and len(time_str) == 5 and time_str[2] == ":"
+    ):
+        return datetime(
+            int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]),
+            int(time_str[0:2]), int(time_str[3:5]),
+        )
+    # Fall back for looser inputs such as single-digit hours
+    return datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M")
+
+
+@lru_cache(maxsize=4096)
+def _parse_dt(date_str: str, time_str: str) -> datetime:
+    """Parse a YYYY-MM-DD date and HH:MM time, memoized across tool calls."""
+    return _fast_dt(date_str, time_str)
+
+
+@lru_cache(maxsize=1024)
+def _cfg(context_id: str) -> Dict[str, Any]:
+    """Graph config for a conversation thread, reused across stream calls."""
+    return {"configurable": {"thread_id": context_id}}
+
+
+def _time_sort_key(time_str: str) -> int:
+    """Minutes since midnight for an HH:MM string; all-day events sort first."""
+    if not time_str or time_str == "All day":
+        return 0
+    # Split on the colon so unpadded hours such as "9:30" sort correctly
+    hour, _, minute = time_str.partition(":")
+    try:
+        return int(hour) * 60 + int(minute[:2])
+    except ValueError:
+        return 0
+
 
 class BookingData(BaseModel):
     """Booking information for itinerary compilation."""
-    booking_type: str = Field(..., description="Type: hotel, flight, activity, restaurant")
-    name: str = Field(..., description="Name of the booking")
-    confirmation_number: str = Field(None, description="Booking confirmation number")
-    date: str = Field(..., description="Date in YYYY-MM-DD format")
-    time: str = Field(None, description="Time in HH:MM format")
-    end_time: str = Field(None, description="End time for activities")
-    location: str = Field(..., description="Location/address")
-    cost: float = Field(..., description="Total cost")
-    notes: str = Field(None, description="Additional notes")
+    # Agents often send confirmation numbers as plain numbers
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+    
+    booking_type: str = Field("unknown", description="Type: hotel, flight, activity, restaurant")
+    name: str = Field("Unnamed booking", description="Name of the booking")
+    confirmation_number: Optional[str] = Field(None, description="Booking confirmation number")
+    date: str = Field("", description="Date in YYYY-MM-DD format")
+    time: Optional[str] = Field(None, description="Time in HH:MM format")
+    end_time: Optional[str] = Field(None, description="End time for activities")
+    location: Optional[str] = Field(None, description="Location/address")
+    cost: Optional[float] = Field(None, description="Total cost")
+    notes: Optional[str] = Field(None, description="Additional notes")
+    duration_hours: Optional[float] = Field(None, description="Duration in hours, used for conflict checks")
 
 
 class ItineraryCompileInput(BaseModel):
@@ -40,7 +115,11 @@ class ItineraryCompileInput(BaseModel):
     destination: str = Field(..., description="Main destination")
     travelers: int = Field(1, description="Number of travelers")
     bookings: List[Dict[str, Any]] = Field(..., description="List of all bookings")
-    preferences: Dict[str, Any] = Field(default_factory=dict, description="User preferences")
+
+
+class CompileAndCheckInput(ItineraryCompileInput):
+    """Input schema for compiling an itinerary and checking it for conflicts."""
+    buffer_minutes: int = Field(30, description="Minimum buffer time between activities")
 
 
 class ConflictCheckInput(BaseModel):
@@ -60,6 +139,10 @@ class ItineraryResponseFormat(BaseModel):
     documents_generated: List[str] = Field(default_factory=list, description="List of generated documents")
 
 
+# Built once at import so each tool call reuses the compiled validator
+_BOOKINGS_ADAPTER = TypeAdapter(List[BookingData])
+
+
 @tool(args_schema=ItineraryCompileInput)
 async def compile_itinerary(
     trip_name: str,
@@ -67,50 +150,87 @@ async def compile_itinerary(
     end_date: str,
     destination: str,
     travelers: int,
-    bookings: List[Dict[str, Any]],
-    preferences: Dict[str, Any] = None
+    bookings: List[Dict[str, Any]]
 ) -> str:
     """Compile all bookings into a structured itinerary."""
+    return _dumps(await _compile_itinerary(
+        trip_name, start_date, end_date, destination, travelers, bookings
+    ))
+
+
+async def _compile_itinerary(
+    trip_name: str,
+    start_date: str,
+    end_date: str,
+    destination: str,
+    travelers: int,
+    bookings: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Build the itinerary for compile_itinerary as a dict."""
     try:
-        preferences = preferences or {}
-        start = datetime.strptime(start_date, "%Y-%m-%d")
-        end = datetime.strptime(end_date, "%Y-%m-%d")
+        start = _parse_date(start_date)
+        end = _parse_date(end_date)
         
-        # Group bookings by date
-        days = {}
-        current_date = start
+        # Validate in one pass; missing fields take the model's defaults
+        bookings = _BOOKINGS_ADAPTER.validate_python(bookings)
         
-        while current_date <= end:
-            date_str = current_date.strftime("%Y-%m-%d")
-            days[date_str] = {
+        # Group bookings by date
+        days = {
+            date_str: {
                 "date": date_str,
-                "day_name": current_date.strftime("%A"),
-                "day_number": (current_date - start).days + 1,
+                "day_name": WEEKDAYS[current_date.weekday()],
+                "day_number": i + 1,
                 "events": []
             }
-            current_date += timedelta(days=1)
+            for i in range((end - start).days + 1)
+            for current_date in (start + timedelta(days=i),)
+            for date_str in (current_date.date().isoformat(),)
+        }
         
-        # Process bookings
-        total_cost = 0
+        # Drop duplicate bookings, e.g. from agents retrying a reservation
+        seen = set()
+        unique = []
         for booking in bookings:
-            booking_date = booking.get("date", "")
-            if booking_date in days:
-                event = {
-                    "time": booking.get("time", "All day"),
-                    "type": booking.get("booking_type", "unknown"),
-                    "name": booking.get("name", "Unnamed booking"),
-                    "location": booking.get("location", ""),
-                    "confirmation": booking.get("confirmation_number", ""),
-                    "cost": booking.get("cost", 0),
-                    "notes": booking.get("notes", ""),
-                    "duration": booking.get("duration_hours", 0)
-                }
-                days[booking_date]["events"].append(event)
-                total_cost += event["cost"]
+            key = (
+                booking.booking_type,
+                booking.name,
+                booking.date,
+                booking.time,
+                booking.confirmation_number,
+            )
+            if key in seen:
+                continue
+            seen.add(key)
+            unique.append(booking)
+        
+        # Process bookings, skipping any that fall outside the trip
+        total_cost = 0
+        days_get = days.get
+        for booking in unique:
+            day = days_get(booking.date)
+            if day is None:
+                continue
+            cost = booking.cost or 0
+            time = booking.time or "All day"
+            day["events"].append({
+                "time": time,
+                "type": booking.booking_type,
+                "name": booking.name,
+                "location": booking.location or "",
+                "confirmation": booking.confirmation_number or "",
+                "cost": cost,
+                "notes": booking.notes or "",
+                "duration": booking.duration_hours or 0,
+                "_sort_key": _time_sort_key(time)
+            })
+            total_cost += cost
         
         # Sort events by time for each day
         for day in days.values():
-            day["events"].sort(key=lambda x: x["time"] if x["time"] != "All day" else "00:00")
+            events = day["events"]
+            events.sort(key=itemgetter("_sort_key"))
+            for event in events:
+                del event["_sort_key"]
         
         # Create summary
         itinerary_data = {
@@ -120,15 +240,15 @@ async def compile_itinerary(
             "travelers": travelers,
             "total_cost": round(total_cost, 2),
             "days": list(days.values()),
-            "booking_count": len(bookings)
+            "booking_count": len(unique)
         }
         
-        return json.dumps(itinerary_data)
+        return itinerary_data
         
     except Exception as e:
-        return json.dumps({
+        return {
             "error": f"Error compiling itinerary: {str(e)}"
-        })
+        }
 
 
 @tool(args_schema=ConflictCheckInput)
@@ -137,65 +257,124 @@ async def check_scheduling_conflicts(
     buffer_minutes: int = 30
 ) -> str:
     """Check for scheduling conflicts between bookings."""
+    return _dumps(await _check_scheduling_conflicts(bookings, buffer_minutes))
+
+
+async def _check_scheduling_conflicts(
+    bookings: List[Dict[str, Any]],
+    buffer_minutes: int
+) -> Dict[str, Any]:
+    """Find the conflicts for check_scheduling_conflicts as a dict."""
     try:
         conflicts = []
         
-        # Sort bookings by date and time
-        sorted_bookings = sorted(
-            bookings,
-            key=lambda x: (x.get("date", ""), x.get("time", "00:00"))
-        )
+        # Bucket timed bookings by date as minutes since midnight, parsing once
+        by_date = defaultdict(list)
+        for booking in bookings:
+            date = booking.get("date")
+            time = booking.get("time")
+            if not date or not time:
+                continue
+            try:
+                parsed = _parse_dt(date, time)
+            except ValueError:
+                continue
+            start_min = parsed.hour * 60 + parsed.minute
+            duration = booking.get("duration_hours")
+            end_min = start_min + duration * 60 if duration else None
+            by_date[date].append((start_min, end_min, booking.get("name"), time))
         
-        # Check for conflicts
-        for i in range(len(sorted_bookings) - 1):
-            current = sorted_bookings[i]
-            next_booking = sorted_bookings[i + 1]
+        # Sweep each day in start order, tracking the latest known end time
+        for date, events in by_date.items():
+            events.sort(key=itemgetter(0))
+            prev_start = prev_name = None
+            current_end = current_name = None
             
-            if current.get("date") == next_booking.get("date"):
-                # Calculate end time of current booking
-                if current.get("time") and current.get("duration_hours"):
-                    try:
-                        start_time = datetime.strptime(f"{current['date']} {current['time']}", "%Y-%m-%d %H:%M")
-                        end_time = start_time + timedelta(hours=current['duration_hours'])
-                        
-                        next_start = datetime.strptime(f"{next_booking['date']} {next_booking['time']}", "%Y-%m-%d %H:%M")
-                        
-                        # Check if there's enough buffer time
-                        time_diff = (next_start - end_time).total_seconds() / 60
-                        
-                        if time_diff < buffer_minutes:
-                            conflicts.append({
-                                "type": "timing_conflict",
-                                "booking1": current["name"],
-                                "booking2": next_booking["name"],
-                                "date": current["date"],
-                                "issue": f"Only {int(time_diff)} minutes between activities (need {buffer_minutes})",
-                                "severity": "high" if time_diff < 0 else "medium"
-                            })
-                    except:
-                        pass
-                
+            for start_min, end_min, name, time in events:
                 # Check for location conflicts (if both at same time)
-                if current.get("time") == next_booking.get("time"):
+                if start_min == prev_start:
                     conflicts.append({
                         "type": "double_booking",
-                        "booking1": current["name"],
-                        "booking2": next_booking["name"],
-                        "date": current["date"],
-                        "time": current["time"],
+                        "booking1": prev_name,
+                        "booking2": name,
+                        "date": date,
+                        "time": time,
                         "issue": "Two bookings at the same time",
                         "severity": "high"
                     })
+                
+                # Check if there's enough buffer time after the running end
+                if current_end is not None:
+                    time_diff = start_min - current_end
+                    if time_diff < buffer_minutes:
+                        conflicts.append({
+                            "type": "timing_conflict",
+                            "booking1": current_name,
+                            "booking2": name,
+                            "date": date,
+                            "issue": f"Only {int(time_diff)} minutes between activities (need {buffer_minutes})",
+                            "severity": "high" if time_diff < 0 else "medium"
+                        })
+                
+                if end_min is not None and (current_end is None or end_min > current_end):
+                    current_end, current_name = end_min, name
+                prev_start, prev_name = start_min, name
         
-        return json.dumps({
+        return {
             "conflicts_found": len(conflicts),
             "conflicts": conflicts
-        })
+        }
         
     except Exception as e:
-        return json.dumps({
+        return {
             "error": f"Error checking conflicts: {str(e)}"
-        })
+        }
+
+
+@tool(args_schema=CompileAndCheckInput)
+async def compile_and_check(
+    trip_name: str,
+    start_date: str,
+    end_date: str,
+    destination: str,
+    travelers: int,
+    bookings: List[Dict[str, Any]],
+    buffer_minutes: int = 30
+) -> str:
+    """Compile all bookings into an itinerary and check them for scheduling conflicts."""
+    # The two steps are independent, so run them concurrently
+    itinerary, conflicts = await asyncio.gather(
+        _compile_itinerary(
+            trip_name, start_date, end_date, destination, travelers, bookings
+        ),
+        _check_scheduling_conflicts(bookings, buffer_minutes),
+    )
+    
+    # Both results are plain dicts, so the combined result is serialized once
+    return _dumps({
+        "itinerary": itinerary,
+        "conflict_check": conflicts
+    })
+
+
+def _format_event(event: Dict[str, Any]) -> str:
+    """Render one itinerary event as a block of markdown lines."""
+    g = event.get
+    # Untimed events are stored as "All day" by compile_itinerary
+    lines = [f"\n**{g('time') or 'All day'}** - {g('name')}"]
+    location = g('location')
+    if location:
+        lines.append(f"{PIN} {location}")
+    confirmation = g('confirmation')
+    if confirmation:
+        lines.append(f"{TICKET} Confirmation: {confirmation}")
+    cost = g('cost') or 0
+    if cost > 0:
+        lines.append(f"{MONEY} Cost: ${cost:.2f}")
+    notes = g('notes')
+    if notes:
+        lines.append(f"{MEMO} {notes}")
+    return "\n".join(lines)
 
 
 class ItineraryAgentA2A:
@@ -211,8 +390,7 @@ Your responsibilities:
 5. Ensure all information is accurate and well-organized
 
 When creating itineraries:
-- Use compile_itinerary to structure all bookings
-- Use check_scheduling_conflicts to identify issues
+- Use compile_and_check to structure all bookings and identify scheduling issues in one step
 - Organize events chronologically for each day
 - Include all confirmation numbers
 - Add travel time estimates between locations
@@ -228,20 +406,11 @@ Always structure your response with:
 Remember: This is the final step. Ensure the itinerary is clear, complete, and ready for the traveler to use."""
     
     def __init__(self):
-        self.model = LLMConfig.get_agent_llm("itinerary")
-        self.tools = [compile_itinerary, check_scheduling_conflicts]
-        
-        self.graph = create_react_agent(
-            self.model,
-            tools=self.tools,
-            checkpointer=memory,
-            prompt=self.SYSTEM_INSTRUCTION,
-            response_format=ItineraryResponseFormat,
-        )
+        self.graph = _build_graph("itinerary")
     
     async def stream(self, query: str, context_id: str) -> AsyncIterable[Dict[str, Any]]:
         """Stream the agent's response."""
-        config = {"configurable": {"thread_id": context_id}}
+        config = _cfg(context_id)
         
         # Add context
         today_str = f"Today's date is {datetime.now().strftime('%Y-%m-%d')}."
@@ -250,7 +419,7 @@ Remember: This is the final step. Ensure the itinerary is clear, complete, and r
         inputs = {"messages": [("user", augmented_query)]}
         
         # Stream processing
-        for item in self.graph.stream(inputs, config, stream_mode="values"):
+        async for item in self.graph.astream(inputs, config, stream_mode="values"):
             message = item["messages"][-1]
             
             if isinstance(message, AIMessage) and message.tool_calls:
@@ -265,57 +434,49 @@ Remember: This is the final step. Ensure the itinerary is clear, complete, and r
                 }
         
         # Get final response
-        yield self._get_final_response(config)
+        yield await self._get_final_response(config)
     
-    def _get_final_response(self, config) -> Dict[str, Any]:
+    async def _get_final_response(self, config) -> Dict[str, Any]:
         """Get the final response from the agent."""
-        current_state = self.graph.get_state(config)
+        current_state = await self.graph.aget_state(config)
         structured_response = current_state.values.get("structured_response")
         
         if structured_response and isinstance(structured_response, ItineraryResponseFormat):
             content_parts = [f"# {structured_response.message}\n"]
             
             if structured_response.conflicts:
-                content_parts.append("\n⚠️ **Scheduling Conflicts Found:**")
-                for conflict in structured_response.conflicts:
-                    content_parts.append(f"- {conflict.get('issue')} on {conflict.get('date')}")
+                content_parts.append(f"\n{WARN} **Scheduling Conflicts Found:**")
+                content_parts.extend([
+                    f"- {conflict.get('issue')} on {conflict.get('date')}"
+                    for conflict in structured_response.conflicts
+                ])
                 content_parts.append("")
             
             if structured_response.itinerary_days:
-                content_parts.append("\n## 📅 Day-by-Day Itinerary\n")
+                content_parts.append(f"\n## {CAL} Day-by-Day Itinerary\n")
                 
                 for day in structured_response.itinerary_days:
                     content_parts.append(f"### Day {day.get('day_number')} - {day.get('day_name')}, {day.get('date')}")
                     
-                    if day.get('events'):
-                        for event in day['events']:
-                            content_parts.append(f"\n**{event.get('time')}** - {event.get('name')}")
-                            if event.get('location'):
-                                content_parts.append(f"📍 {event['location']}")
-                            if event.get('confirmation'):
-                                content_parts.append(f"🎫 Confirmation: {event['confirmation']}")
-                            if event.get('cost') > 0:
-                                content_parts.append(f"💰 Cost: ${event['cost']:.2f}")
-                            if event.get('notes'):
-                                content_parts.append(f"📝 {event['notes']}")
+                    events = day.get('events')
+                    if events:
+                        content_parts.extend([_format_event(event) for event in events])
                     else:
                         content_parts.append("\n*No scheduled activities*")
                     
                     content_parts.append("")
             
             if structured_response.total_cost > 0:
-                content_parts.append(f"\n## 💵 Trip Summary")
+                content_parts.append(f"\n## {CASH} Trip Summary")
                 content_parts.append(f"- **Total Cost**: ${structured_response.total_cost:.2f}")
             
             if structured_response.important_notes:
-                content_parts.append(f"\n## 📋 Important Notes")
-                for note in structured_response.important_notes:
-                    content_parts.append(f"- {note}")
+                content_parts.append(f"\n## {CLIPBOARD} Important Notes")
+                content_parts.extend([f"- {note}" for note in structured_response.important_notes])
             
             if structured_response.documents_generated:
-                content_parts.append(f"\n## 📄 Generated Documents")
-                for doc in structured_response.documents_generated:
-                    content_parts.append(f"- {doc}")
+                content_parts.append(f"\n## {DOCUMENT} Generated Documents")
+                content_parts.extend([f"- {doc}" for doc in structured_response.documents_generated])
             
             return {
                 "is_task_complete": True,
@@ -332,4 +493,31 @@ Remember: This is the final step. Ensure the itinerary is clear, complete, and r
             "is_task_complete": False,
             "content": "Unable to compile itinerary. Please ensure all booking information is provided.",
             "data": {}
-        }
\ No newline at end of file
+        }
+
+
+def _build_graph(name: str):
+    """Build the react agent graph for ``name`` once and reuse it."""
+    if name in _GRAPH_CACHE:
+        return _GRAPH_CACHE[name]
+    
+    model = LLMConfig.get_agent_llm(name)
+    tools = [compile_and_check]
+    
+    graph = create_react_agent(
+        model,
+        tools=tools,
+        checkpointer=memory,
+        prompt=ItineraryAgentA2A.SYSTEM_INSTRUCTION,
+        response_format=ItineraryResponseFormat,
+    )
+    _GRAPH_CACHE[name] = graph
+    return graph
+
+
+def get_itinerary_agent() -> ItineraryAgentA2A:
+    """Return the process-wide itinerary agent; conversations are isolated by thread_id."""
+    global _singleton
+    if _singleton is None:
+        _singleton = ItineraryAgentA2A()
+    return _singleton
@@ -4,6 +4,7 @@ Orchestrator Agent A2A Server.
 import asyncio
 import logging
 import os
+import uuid
 from typing import Optional
 
 import uvicorn
@@ -17,6 +18,10 @@ from a2a.types import (
     ConversationMetadata,
     ConversationParticipant,
     ConversationRole,
+    TaskArtifact,
+    TaskStatus,
+    TextArtifact,
+    TextPart,
 )
 from a2a.server.agent_execution import AgentExecutor
 from a2a.server.agent_execution.context import RequestContext
@@ -29,7 +34,7 @@ from starlette.requests import Request
 from starlette.responses import JSONResponse
 
 from .orchestrator_a2a import OrchestratorAgentA2A
-from ...security.auth import security_manager, get_ssl_context, A2ASecurityMiddleware
+from ...security.auth import security_manager, get_ssl_context, A2ASecurityMiddleware, PUBLIC_PATHS, is_trusted_host
 
 
 load_dotenv()
@@ -85,6 +90,8 @@ class OrchestratorExecutor(AgentExecutor):
         query = " ".join([part.text for part in context.message.parts if part.text])
         context_id = context.message.context_id or str(uuid.uuid4())
         
+        last_status = None
+        
         try:
             # Stream the agent's response
             async for update in self.agent.stream(query, context_id):
@@ -93,9 +100,6 @@ class OrchestratorExecutor(AgentExecutor):
                     content = update.get("content", "Task completed")
                     
                     # Create artifact
-                    from a2a.types import TaskArtifact, TextArtifact, TextPart, TaskStatus
-                    import uuid
-                    
                     artifact = TaskArtifact(
                         id=str(uuid.uuid4()),
                         type="text",
@@ -110,11 +114,13 @@ class OrchestratorExecutor(AgentExecutor):
                         status=TaskStatus.COMPLETED,
                         artifacts=[artifact],
                     )
-                else:
-                    # Progress update
+                    last_status = TaskStatus.COMPLETED
+                elif last_status != TaskStatus.IN_PROGRESS:
+                    # Progress update; only sent on the transition into IN_PROGRESS
                     await task_updater.update_task(
                         status=TaskStatus.IN_PROGRESS,
                     )
+                    last_status = TaskStatus.IN_PROGRESS
             
             return await task_updater.get_task()
             
@@ -202,13 +208,13 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         self.security = A2ASecurityMiddleware(service_id)
     
     async def dispatch(self, request: Request, call_next):
-        # Skip security for health check
-        if request.url.path == "/health":
+        # Skip security for public endpoints and trusted internal callers
+        client_host = request.client.host if request.client else None
+        if request.url.path in PUBLIC_PATHS or is_trusted_host(client_host):
             return await call_next(request)
         
         # Verify incoming request
-        headers = dict(request.headers)
-        is_valid, requester = await self.security.verify_incoming_request(headers)
+        is_valid, requester = await self.security.verify_incoming_request(request.headers)
         
         if not is_valid:
             return JSONResponse(
@@ -220,7 +226,7 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         request.state.requester = requester
         
         # Check rate limit
-        if not security_manager.check_rate_limit(requester or request.client.host):
+        if not security_manager.check_rate_limit(requester or client_host):
             return JSONResponse(
                 status_code=429,
                 content={"error": "Rate limit exceeded"}
@@ -2,10 +2,11 @@
 Orchestrator Agent implementation.
 """
 import asyncio
-from typing import Optional, Dict, Any, List
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Set
 import logging
 from datetime import datetime
-import uuid
+import os
 
 from ...shared.base_agent import BaseAgent
 from ...shared.models import (
@@ -23,6 +24,19 @@ from .tools import TaskAnalyzer, ConflictResolver, DependencyManager
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class SessionState:
+    """In-memory tracking for one orchestrated session."""
+    status: str = "initializing"
+    agents_ready: Set[str] = field(default_factory=set)
+    pending_agents: Set[str] = field(default_factory=set)
+    pending_conflicts: List[ConflictInfo] = field(default_factory=list)
+    human_approvals: List[HumanApprovalRequest] = field(default_factory=list)
+    task_analysis: Optional[Dict[str, Any]] = None
+    # Unmet dependency counts per agent, updated through DependencyManager.mark_complete
+    unmet_dependencies: Dict[str, int] = field(default_factory=dict)
+
+
 class OrchestratorAgent(BaseAgent):
     """Orchestrator agent that coordinates all other agents."""
     
@@ -31,50 +45,81 @@ class OrchestratorAgent(BaseAgent):
         self.task_analyzer = TaskAnalyzer()
         self.conflict_resolver = ConflictResolver()
         self.dependency_manager = DependencyManager()
-        self.active_sessions: Dict[str, Dict[str, Any]] = {}
+        self.active_sessions: Dict[str, SessionState] = {}
+        
+        # Random bytes drawn in bulk and sliced into 128-bit message IDs
+        self._id_pool = bytearray()
+        self._id_off = 0
+        
+        # Message type -> handler, looked up once per message
+        self._HANDLERS = {
+            MessageType.TASK_ASSIGNMENT: self._handle_new_request,
+            MessageType.CONFLICT_ALERT: self._handle_conflict,
+            MessageType.STATUS_UPDATE: self._handle_status_update,
+            MessageType.HUMAN_ESCALATION: self._handle_human_escalation,
+            MessageType.COMPLETION_NOTIFICATION: self._handle_completion,
+        }
+    
+    def _mkid(self) -> str:
+        """Return a random 32-char hex ID from the pooled entropy buffer."""
+        if self._id_off + 16 > len(self._id_pool):
+            self._id_pool = bytearray(os.urandom(4096))
+            self._id_off = 0
+        off = self._id_off
+        self._id_off = off + 16
+        return self._id_pool[off:off + 16].hex()
+    
+    def _task_message(self, envelope: Dict[str, Any], recipient: str,
+                      task_details: Dict[str, Any]) -> AgentMessage:
+        """Build a task assignment on a shared envelope without re-validating it."""
+        return AgentMessage.model_construct(
+            message_id=self._mkid(),
+            recipient=recipient,
+            content={
+                "task": task_details,
+                "deadline": None,
+                "priority": task_details.get("priority", 5)
+            },
+            **envelope
+        )
         
+    def _init_local(self, session_id: str) -> SessionState:
+        """Create the in-memory tracking record for a session."""
+        session = SessionState(unmet_dependencies=self.dependency_manager.new_progress())
+        self.active_sessions[session_id] = session
+        return session
+    
     async def initialize(self, session_id: str):
         """Initialize orchestrator for a new session."""
-        self.active_sessions[session_id] = {
-            "status": "initializing",
-            "agents_ready": set(),
-            "pending_conflicts": [],
-            "human_approvals": []
-        }
+        self._init_local(session_id)
         await self.update_status(session_id, "active")
-        logger.info(f"Orchestrator initialized for session {session_id}")
+        logger.info("Orchestrator initialized for session %s", session_id)
     
     async def process_message(self, message: AgentMessage) -> Optional[AgentMessage]:
         """Process incoming messages and coordinate responses."""
-        logger.info(f"Orchestrator processing {message.message_type} from {message.sender}")
+        logger.info("Orchestrator processing %s from %s", message.message_type, message.sender)
         
-        if message.message_type == MessageType.TASK_ASSIGNMENT:
-            return await self._handle_new_request(message)
-        
-        elif message.message_type == MessageType.CONFLICT_ALERT:
-            return await self._handle_conflict(message)
-        
-        elif message.message_type == MessageType.STATUS_UPDATE:
-            return await self._handle_status_update(message)
-        
-        elif message.message_type == MessageType.HUMAN_ESCALATION:
-            return await self._handle_human_escalation(message)
-        
-        elif message.message_type == MessageType.COMPLETION_NOTIFICATION:
-            return await self._handle_completion(message)
-        
-        return None
+        handler = self._HANDLERS.get(message.message_type)
+        return await handler(message) if handler else None
     
     async def _handle_new_request(self, message: AgentMessage) -> Optional[AgentMessage]:
         """Handle new travel request and distribute tasks."""
         session_id = message.session_id
         preferences = TravelPreferences(**message.content["preferences"])
         
-        # Initialize session
-        await self.initialize(session_id)
-        
-        # Get current state
-        state = await self.get_state(session_id)
+        # Fields used by several task assignments below
+        start_iso = preferences.start_date.isoformat()
+        end_iso = preferences.end_date.isoformat()
+        destination = preferences.destination
+        travelers = preferences.travelers
+        
+        # Initialize session and fetch current state in one round trip
+        session = self._init_local(session_id)
+        state, _ = await asyncio.gather(
+            self.get_state(session_id),
+            self.update_status(session_id, "active")
+        )
+        logger.info("Orchestrator initialized for session %s", session_id)
         
         # Analyze request and create task assignments
         task_analysis = await self.task_analyzer.analyze_request(
@@ -85,73 +130,74 @@ class OrchestratorAgent(BaseAgent):
         )
         
         # Update session tracking
-        self.active_sessions[session_id]["task_analysis"] = task_analysis
-        self.active_sessions[session_id]["status"] = "distributing_tasks"
-        
-        # Create task assignments for each agent
-        tasks = []
-        
-        # 1. Budget Agent - Always active for monitoring
-        budget_task = MessageBuilder.create_task_assignment(
-            sender=self.name,
-            recipient="budget",
-            session_id=session_id,
-            task_details={
-                "action": "monitor",
-                "budget_limit": preferences.budget,
-                "currency": preferences.currency,
-                "alert_threshold": 0.8  # Alert at 80% spent
-            }
-        )
-        tasks.append(self.send_message(budget_task))
+        session.task_analysis = task_analysis
+        session.status = "distributing_tasks"
+        
+        # Envelope fields shared by every task assignment below
+        envelope = {
+            "sender": self.name,
+            "session_id": session_id,
+            "message_type": MessageType.TASK_ASSIGNMENT
+        }
         
-        # 2. Hotel Agent - First priority
-        hotel_task = MessageBuilder.create_task_assignment(
-            sender=self.name,
-            recipient="hotel",
-            session_id=session_id,
-            task_details={
-                "action": "search_and_book",
-                "destination": preferences.destination,
-                "check_in": preferences.start_date.isoformat(),
-                "check_out": preferences.end_date.isoformat(),
-                "guests": preferences.travelers,
-                "preferences": {
-                    "rating": preferences.preferred_hotel_rating,
-                    "max_budget": task_analysis["hotel_budget"]
+        # Create task assignments for each agent; sends are scheduled as
+        # each message is built and the block waits for all of them
+        async with asyncio.TaskGroup() as tg:
+            # 1. Budget Agent - Always active for monitoring
+            budget_task = self._task_message(
+                envelope,
+                "budget",
+                {
+                    "action": "monitor",
+                    "budget_limit": preferences.budget,
+                    "currency": preferences.currency,
+                    "alert_threshold": 0.8  # Alert at 80% spent
                 }
-            }
-        )
-        tasks.append(self.send_message(hotel_task))
-        
-        # 3. Transport Agent - Can run parallel with hotel
-        transport_task = MessageBuilder.create_task_assignment(
-            sender=self.name,
-            recipient="transport",
-            session_id=session_id,
-            task_details={
-                "action": "search_and_book",
-                "origin": preferences.origin,
-                "destination": preferences.destination,
-                "departure_date": preferences.start_date.isoformat(),
-                "return_date": preferences.end_date.isoformat(),
-                "travelers": preferences.travelers,
-                "preferences": {
-                    "mode": preferences.preferred_transport_mode,
-                    "max_budget": task_analysis["transport_budget"]
+            )
+            tg.create_task(self.send_message(budget_task))
+            
+            # 2. Hotel Agent - First priority
+            hotel_task = self._task_message(
+                envelope,
+                "hotel",
+                {
+                    "action": "search_and_book",
+                    "destination": destination,
+                    "check_in": start_iso,
+                    "check_out": end_iso,
+                    "guests": travelers,
+                    "preferences": {
+                        "rating": preferences.preferred_hotel_rating,
+                        "max_budget": task_analysis["hotel_budget"]
+                    }
                 }
-            }
-        )
-        tasks.append(self.send_message(transport_task))
-        
-        # Wait for initial tasks to be distributed
-        await asyncio.gather(*tasks)
+            )
+            tg.create_task(self.send_message(hotel_task))
+            
+            # 3. Transport Agent - Can run parallel with hotel
+            transport_task = self._task_message(
+                envelope,
+                "transport",
+                {
+                    "action": "search_and_book",
+                    "origin": preferences.origin,
+                    "destination": destination,
+                    "departure_date": start_iso,
+                    "return_date": end_iso,
+                    "travelers": travelers,
+                    "preferences": {
+                        "mode": preferences.preferred_transport_mode,
+                        "max_budget": task_analysis["transport_budget"]
+                    }
+                }
+            )
+            tg.create_task(self.send_message(transport_task))
         
         # Activity Agent will be triggered after hotel confirmation
-        self.active_sessions[session_id]["pending_agents"] = ["activity", "itinerary"]
+        session.pending_agents = {"activity", "itinerary"}
         
         return AgentMessage(
-            message_id=str(uuid.uuid4()),
+            message_id=self._mkid(),
             sender=self.name,
             recipient=message.sender,
             session_id=session_id,
@@ -166,12 +212,14 @@ class OrchestratorAgent(BaseAgent):
     async def _handle_conflict(self, message: AgentMessage) -> Optional[AgentMessage]:
         """Handle conflicts reported by agents."""
         session_id = message.session_id
-        conflict_info = ConflictInfo(**message.content["conflict"])
+        # Conflicts arrive over the wire, so validate them at the boundary
+        conflict_data = message.content["conflict"]
+        conflict_info = ConflictInfo.model_validate(conflict_data)
         
-        logger.warning(f"Conflict detected: {conflict_info.conflict_type}")
+        logger.warning("Conflict detected: %s", conflict_info.conflict_type)
         
         # Add to session tracking
-        self.active_sessions[session_id]["pending_conflicts"].append(conflict_info)
+        self.active_sessions[session_id].pending_conflicts.append(conflict_info)
         
         # Get current state
         state = await self.get_state(session_id)
@@ -185,26 +233,23 @@ class OrchestratorAgent(BaseAgent):
         
         if resolution_plan["can_resolve_automatically"]:
             # Send resolution instructions to affected agents
-            resolution_tasks = []
-            
-            for agent, instruction in resolution_plan["instructions"].items():
-                resolution_message = AgentMessage(
-                    message_id=str(uuid.uuid4()),
-                    sender=self.name,
-                    recipient=agent,
-                    session_id=session_id,
-                    message_type=MessageType.MODIFICATION_REQUEST,
-                    content=instruction
-                )
-                resolution_tasks.append(self.send_message(resolution_message))
-            
-            await asyncio.gather(*resolution_tasks)
+            async with asyncio.TaskGroup() as tg:
+                for agent, instruction in resolution_plan["instructions"].items():
+                    resolution_message = AgentMessage(
+                        message_id=self._mkid(),
+                        sender=self.name,
+                        recipient=agent,
+                        session_id=session_id,
+                        message_type=MessageType.MODIFICATION_REQUEST,
+                        content=instruction
+                    )
+                    tg.create_task(self.send_message(resolution_message))
             
             # Log conflict resolution
             await self.state_manager.add_conflict(session_id, conflict_info)
             
             return AgentMessage(
-                message_id=str(uuid.uuid4()),
+                message_id=self._mkid(),
                 sender=self.name,
                 recipient=message.sender,
                 session_id=session_id,
@@ -220,7 +265,7 @@ class OrchestratorAgent(BaseAgent):
                 session_id,
                 f"Conflict: {conflict_info.conflict_type}",
                 {
-                    "conflict": conflict_info.dict(),
+                    "conflict": conflict_data,
                     "current_bookings": state["bookings"],
                     "attempted_resolution": resolution_plan
                 },
@@ -235,15 +280,20 @@ class OrchestratorAgent(BaseAgent):
         sender = message.sender
         status = message.content.get("status")
         
-        logger.info(f"Status update from {sender}: {status}")
+        logger.info("Status update from %s: %s", sender, status)
         
         # Update agent status in state
         await self.update_status(session_id, "processing_update")
+        session = self.active_sessions[session_id]
         
         # Handle specific status types
-        if status == "booking_confirmed" and sender == "hotel":
+        ready = []
+        if status == "booking_confirmed":
+            ready = self.dependency_manager.mark_complete(sender, session.unmet_dependencies)
+        
+        if "activity" in ready:
             # Hotel is booked, now activate Activity Agent
-            if "activity" in self.active_sessions[session_id].get("pending_agents", []):
+            if "activity" in session.pending_agents:
                 hotel_location = message.content.get("details", {}).get("location")
                 
                 activity_task = MessageBuilder.create_task_assignment(
@@ -263,7 +313,7 @@ class OrchestratorAgent(BaseAgent):
                 )
                 
                 await self.send_message(activity_task)
-                self.active_sessions[session_id]["pending_agents"].remove("activity")
+                session.pending_agents.discard("activity")
         
         # Check if all bookings are complete
         if await self._check_all_bookings_complete(session_id):
@@ -276,16 +326,16 @@ class OrchestratorAgent(BaseAgent):
         """Handle human escalation requests."""
         session_id = message.session_id
         
-        approval_request = HumanApprovalRequest(
-            request_id=str(uuid.uuid4()),
-            session_id=session_id,
-            reason=message.content["reason"],
-            context=message.content["context"],
-            options=message.content["options"]
-        )
+        approval_request = HumanApprovalRequest.model_validate({
+            "request_id": self._mkid(),
+            "session_id": session_id,
+            "reason": message.content["reason"],
+            "context": message.content["context"],
+            "options": message.content["options"]
+        })
         
         # Store in session
-        self.active_sessions[session_id]["human_approvals"].append(approval_request)
+        self.active_sessions[session_id].human_approvals.append(approval_request)
         
         # Update state to require human approval
         await self.state_manager.request_human_approval(
@@ -293,7 +343,7 @@ class OrchestratorAgent(BaseAgent):
             approval_request.dict()
         )
         
-        logger.info(f"Human approval requested for session {session_id}: {approval_request.reason}")
+        logger.info("Human approval requested for session %s: %s", session_id, approval_request.reason)
         
         return None
     
@@ -306,7 +356,7 @@ class OrchestratorAgent(BaseAgent):
             await self.state_manager.finalize_session(session_id, "completed")
             
             return AgentMessage(
-                message_id=str(uuid.uuid4()),
+                message_id=self._mkid(),
                 sender=self.name,
                 recipient="user",  # Special recipient for user notifications
                 session_id=session_id,
@@ -330,8 +380,8 @@ class OrchestratorAgent(BaseAgent):
         
         # Activities are optional
         # Check if there are no pending agents
-        pending = self.active_sessions[session_id].get("pending_agents", [])
-        no_pending = len([a for a in pending if a != "itinerary"]) == 0
+        pending = self.active_sessions[session_id].pending_agents
+        no_pending = not (pending - {"itinerary"})
         
         return has_hotel and has_transport and no_pending
     
@@ -354,8 +404,7 @@ class OrchestratorAgent(BaseAgent):
         await self.send_message(itinerary_task)
         
         # Remove from pending
-        if "itinerary" in self.active_sessions[session_id].get("pending_agents", []):
-            self.active_sessions[session_id]["pending_agents"].remove("itinerary")
+        self.active_sessions[session_id].pending_agents.discard("itinerary")
     
     async def _escalate_to_human(self, session_id: str, reason: str,
                                 context: Dict[str, Any], options: List[Dict[str, Any]]):
@@ -363,7 +412,7 @@ class OrchestratorAgent(BaseAgent):
         await self.request_human_approval(session_id, reason, context, options)
         
         # Pause automated processing
-        self.active_sessions[session_id]["status"] = "awaiting_human_approval"
+        self.active_sessions[session_id].status = "awaiting_human_approval"
         
     async def handle_human_decision(self, session_id: str, decision: Dict[str, Any]):
         """Handle human decision on escalated issue."""
@@ -378,17 +427,18 @@ class OrchestratorAgent(BaseAgent):
             # Implement the chosen option
             chosen_option = decision.get("chosen_option")
             if chosen_option:
-                # Send instructions to relevant agents
-                for agent, instruction in chosen_option.get("actions", {}).items():
-                    message = AgentMessage(
-                        message_id=str(uuid.uuid4()),
-                        sender=self.name,
-                        recipient=agent,
-                        session_id=session_id,
-                        message_type=MessageType.MODIFICATION_REQUEST,
-                        content=instruction
-                    )
-                    await self.send_message(message)
+                # Send instructions to relevant agents concurrently
+                async with asyncio.TaskGroup() as tg:
+                    for agent, instruction in chosen_option.get("actions", {}).items():
+                        message = AgentMessage(
+                            message_id=self._mkid(),
+                            sender=self.name,
+                            recipient=agent,
+                            session_id=session_id,
+                            message_type=MessageType.MODIFICATION_REQUEST,
+                            content=instruction
+                        )
+                        tg.create_task(self.send_message(message))
         
         # Resume normal processing
-        self.active_sessions[session_id]["status"] = "active"
\ No newline at end of file
+        self.active_sessions[session_id].status = "active"
\ No newline at end of file
@@ -2,12 +2,14 @@
 Orchestrator Agent implementation with A2A protocol.
 """
 import asyncio
-import json
-import uuid
+import itertools
+import os
 from datetime import datetime
 from typing import Any, AsyncIterable, List, Dict, Optional
 
+import orjson
 from a2a.types import (
+    Message,
     MessageSendParams,
     SendMessageRequest,
     SendMessageResponse,
@@ -16,6 +18,7 @@ from a2a.types import (
 )
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.prebuilt import create_react_agent
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 
@@ -29,6 +32,17 @@ from ...shared.models import TravelPreferences
 memory = MemorySaver()
 
 
+def _dumps(obj: Any) -> str:
+    """Serialize a tool result to a JSON string."""
+    return orjson.dumps(obj).decode()
+
+
+def _status_value(status: Any) -> Any:
+    """Plain value for a task status, whether an enum or a TaskStatus model."""
+    status = getattr(status, "state", status)
+    return getattr(status, "value", status)
+
+
 class AgentTaskInput(BaseModel):
     """Input for sending tasks to agents."""
     agent_name: str = Field(..., description="Name of the agent to send task to")
@@ -100,12 +114,25 @@ Important:
         
         # Store agent URLs for async initialization
         self._agent_urls = remote_agent_urls
+        
+        # Random bytes drawn in bulk and sliced into 128-bit message IDs
+        self._id_pool = bytearray()
+        self._id_off = 0
+        self._task_counter = itertools.count(1)
+    
+    def _mkid(self) -> str:
+        """Return a random 32-char hex ID from the pooled entropy buffer."""
+        if self._id_off + 16 > len(self._id_pool):
+            self._id_pool = bytearray(os.urandom(4096))
+            self._id_off = 0
+        off = self._id_off
+        self._id_off = off + 16
+        return self._id_pool[off:off + 16].hex()
     
     async def initialize(self):
         """Initialize connections to remote agents."""
         # Connect to all remote agents
-        for url in self._agent_urls:
-            await self.remote_manager.add_agent(url)
+        await self.remote_manager.add_agents(self._agent_urls)
         
         # Create tools with the remote manager
         self.tools = [
@@ -140,36 +167,51 @@ Today's date: {datetime.now().strftime('%Y-%m-%d')}"""
     def _create_send_task_tool(self):
         """Create the tool for sending tasks to agents."""
         remote_manager = self.remote_manager
+        mkid = self._mkid
+        task_counter = self._task_counter
+        
+        # Connections resolved by this tool, valid while the manager version is unchanged
+        conn_cache: Dict[str, Any] = {}
+        cache_version = remote_manager.version
         
         @tool(args_schema=AgentTaskInput)
-        async def send_task_to_agent(agent_name: str, task: str) -> str:
+        async def send_task_to_agent(agent_name: str, task: str, config: RunnableConfig) -> str:
             """Send a task to a specific agent and get their response."""
-            connection = remote_manager.get_connection(agent_name)
+            nonlocal cache_version
+            if cache_version != remote_manager.version:
+                conn_cache.clear()
+                cache_version = remote_manager.version
+            
+            connection = conn_cache.get(agent_name)
+            if connection is None:
+                connection = remote_manager.get_connection(agent_name)
+                if connection:
+                    conn_cache[agent_name] = connection
             
             if not connection:
-                return json.dumps({
+                return _dumps({
                     "error": f"Agent {agent_name} not found. Available agents: {list(remote_manager.connections.keys())}"
                 })
             
             try:
-                # Create message request
-                message_id = str(uuid.uuid4())
-                task_id = str(uuid.uuid4())
-                context_id = str(uuid.uuid4())
+                # Create message request; tasks share the conversation's context
+                # so remote agents can correlate work from the same thread
+                message_id = mkid()
+                context_id = (config.get("configurable") or {}).get("thread_id") or mkid()
+                task_id = f"{context_id}-{next(task_counter)}"
                 
-                payload = {
-                    "message": {
-                        "role": "user",
-                        "parts": [{"type": "text", "text": task}],
-                        "messageId": message_id,
-                        "taskId": task_id,
-                        "contextId": context_id,
-                    },
-                }
+                message = Message.model_validate({
+                    "role": "user",
+                    "parts": [{"type": "text", "text": task}],
+                    "messageId": message_id,
+                    "taskId": task_id,
+                    "contextId": context_id,
+                })
                 
-                message_request = SendMessageRequest(
-                    id=message_id, 
-                    params=MessageSendParams.model_validate(payload)
+                # The envelopes only wrap the message validated above
+                message_request = SendMessageRequest.model_construct(
+                    id=message_id,
+                    params=MessageSendParams.model_construct(message=message)
                 )
                 
                 # Send message
@@ -177,28 +219,29 @@ Today's date: {datetime.now().strftime('%Y-%m-%d')}"""
                 
                 # Process response
                 if isinstance(response.root, SendMessageSuccessResponse) and isinstance(response.root.result, Task):
-                    # Extract response content
-                    response_parts = []
-                    if response.root.result.artifacts:
-                        for artifact in response.root.result.artifacts:
-                            if hasattr(artifact.artifact, 'parts'):
-                                for part in artifact.artifact.parts:
-                                    if hasattr(part, 'text'):
-                                        response_parts.append(part.text)
+                    # Extract text from every artifact part that has any
+                    result = response.root.result
+                    response_text = "\n".join(
+                        text
+                        for artifact in (result.artifacts or ())
+                        for part in (getattr(artifact.artifact, 'parts', None) or ())
+                        for text in (getattr(part, 'text', None),)
+                        if text
+                    )
                     
-                    return json.dumps({
+                    return _dumps({
                         "agent": agent_name,
-                        "status": response.root.result.status,
-                        "response": "\n".join(response_parts) if response_parts else "Task received",
+                        "status": _status_value(result.status),
+                        "response": response_text or "Task received",
                     })
                 else:
-                    return json.dumps({
+                    return _dumps({
                         "agent": agent_name,
                         "error": "Invalid response format"
                     })
                     
             except Exception as e:
-                return json.dumps({
+                return _dumps({
                     "agent": agent_name,
                     "error": f"Communication error: {str(e)}"
                 })
@@ -228,10 +271,10 @@ Today's date: {datetime.now().strftime('%Y-%m-%d')}"""
                 if hotel_responses and transport_responses:
                     analysis["recommendations"].append("Check that flight arrival aligns with hotel check-in time")
                 
-                return json.dumps(analysis)
+                return _dumps(analysis)
                 
             except Exception as e:
-                return json.dumps({"error": f"Analysis failed: {str(e)}"})
+                return _dumps({"error": f"Analysis failed: {str(e)}"})
         
         return analyze_agent_responses
     
@@ -248,7 +291,7 @@ Today's date: {datetime.now().strftime('%Y-%m-%d')}"""
         inputs = {"messages": [("user", query)]}
         
         # Stream processing
-        for item in self.graph.stream(inputs, config, stream_mode="values"):
+        async for item in self.graph.astream(inputs, config, stream_mode="values"):
             message = item["messages"][-1]
             
             # Yield progress updates
@@ -259,11 +302,11 @@ Today's date: {datetime.now().strftime('%Y-%m-%d')}"""
                 }
         
         # Get final response
-        yield self._get_final_response(config)
+        yield await self._get_final_response(config)
     
-    def _get_final_response(self, config) -> Dict[str, Any]:
+    async def _get_final_response(self, config) -> Dict[str, Any]:
         """Format the final response."""
-        current_state = self.graph.get_state(config)
+        current_state = await self.graph.aget_state(config)
         response = current_state.values.get("structured_response")
         
         if response and isinstance(response, OrchestratorResponseFormat):
@@ -1,9 +1,11 @@
 """
 Remote agent connection management for A2A protocol.
 """
-from typing import Callable, Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Set
+import asyncio
+import logging
 import httpx
-from a2a.client import A2AClient
+from a2a.client import A2ACardResolver, A2AClient
 from a2a.types import (
     AgentCard,
     SendMessageRequest,
@@ -16,24 +18,41 @@ import os
 from ...security.auth import A2ASecurityMiddleware
 
 
+logger = logging.getLogger(__name__)
+
+
 TaskCallbackArg = Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent
 TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
 
+# Keep-alive pool settings for agent clients; concurrent requests to one agent
+# share a single HTTP/2 connection instead of each opening their own
+AGENT_HTTP_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=32,
+    keepalive_expiry=300.0,
+)
 
 class RemoteAgentConnection:
     """A class to hold the connection to a remote agent."""
     
-    def __init__(self, agent_card: AgentCard, agent_url: str, service_id: str = "orchestrator"):
-        print(f"Connecting to agent: {agent_card.info.name}")
-        print(f"Agent URL: {agent_url}")
+    def __init__(self, agent_card: AgentCard, agent_url: str, service_id: str = "orchestrator",
+                 client: Optional[httpx.AsyncClient] = None):
+        logger.debug("Connecting to agent: %s at %s", agent_card.info.name, agent_url)
         
         # Create security middleware
         self.security = A2ASecurityMiddleware(service_id)
         
-        # Create HTTP client with security headers
-        self._httpx_client = httpx.AsyncClient(
+        # Reuse the caller's client if given (it must already add security
+        # headers); otherwise create and own one
+        self._owns_client = client is None
+        self._httpx_client = client or httpx.AsyncClient(
             timeout=30,
-            event_hooks={"request": [self._add_security_headers]}
+            http2=True,
+            limits=AGENT_HTTP_LIMITS,
+            event_hooks={
+                "request": [self._add_security_headers],
+                "response": [self._check_auth_response],
+            }
         )
         self.agent_client = A2AClient(self._httpx_client, agent_card, url=agent_url)
         self.card = agent_card
@@ -41,12 +60,20 @@ class RemoteAgentConnection:
         self.conversation_name = None
         self.conversation = None
         self.pending_tasks = set()
+        
+        # Outgoing messages are queued and sent in batches by a background flusher
+        self._send_queue: asyncio.Queue = asyncio.Queue()
+        self._flusher: Optional[asyncio.Task] = None
+        self._in_flight: Set[asyncio.Task] = set()
     
     async def _add_security_headers(self, request):
         """Add security headers to outgoing requests."""
-        headers = dict(request.headers)
-        headers = await self.security.add_auth_header(headers)
-        request.headers = httpx.Headers(headers)
+        request.headers.update(self.security.get_auth_headers())
+    
+    async def _check_auth_response(self, response):
+        """Re-mint the cached token if the agent rejected it."""
+        if response.status_code == 401:
+            self.security.invalidate_auth_headers()
     
     def get_agent(self) -> AgentCard:
         """Get the agent card."""
@@ -64,54 +91,200 @@ class RemoteAgentConnection:
         self, message_request: SendMessageRequest
     ) -> SendMessageResponse:
         """Send a message to the remote agent."""
-        return await self.agent_client.send_message(message_request)
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+        
+        future = asyncio.get_running_loop().create_future()
+        self._send_queue.put_nowait((message_request, future))
+        return await future
+    
+    async def _flush_loop(self, max_batch: int = 32, max_delay: float = 0.005):
+        """Drain queued messages into batches, each sent by its own task."""
+        queue = self._send_queue
+        
+        while True:
+            batch = [await queue.get()]
+            
+            try:
+                # A lone message goes out at once; only a burst waits for the
+                # rest of itself to arrive before being sent together
+                if not queue.empty():
+                    await asyncio.sleep(max_delay)
+                    while len(batch) < max_batch and not queue.empty():
+                        batch.append(queue.get_nowait())
+            except asyncio.CancelledError:
+                self._fail_pending(batch)
+                raise
+            
+            # A send only returns once the agent has finished the task, so the
+            # next batch must not wait behind this one
+            task = asyncio.create_task(self._dispatch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+    
+    async def _dispatch(self, batch: List[Any]):
+        """Send one batch and resolve each caller's future with its response."""
+        try:
+            results = await self.send_message_batch(
+                [request for request, _ in batch], return_exceptions=True
+            )
+        except asyncio.CancelledError:
+            self._fail_pending(batch)
+            raise
+        
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+    
+    def _fail_pending(self, batch: List[Any] = ()):
+        """Fail the futures of messages that will never be sent."""
+        pending = list(batch)
+        while not self._send_queue.empty():
+            pending.append(self._send_queue.get_nowait())
+        
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(ConnectionError(f"Connection to {self.url} closed"))
+    
+    async def send_message_batch(
+        self, message_requests: List[SendMessageRequest], max_messages: int = 32,
+        return_exceptions: bool = False
+    ) -> List[SendMessageResponse]:
+        """Send several messages to the remote agent, returning responses in order.
+        
+        A2A servers do not accept JSON-RPC batch arrays, so the requests are
+        issued concurrently over the pooled HTTP/2 connection instead,
+        ``max_messages`` at a time. With ``return_exceptions`` a failed send
+        appears in its slot instead of failing the whole batch.
+        """
+        responses: List[SendMessageResponse] = []
+        for start in range(0, len(message_requests), max_messages):
+            chunk = message_requests[start:start + max_messages]
+            responses.extend(await asyncio.gather(
+                *(self.agent_client.send_message(request) for request in chunk),
+                return_exceptions=return_exceptions
+            ))
+        return responses
     
     async def close(self):
         """Close the connection."""
-        await self._httpx_client.aclose()
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        
+        # Batches already handed off fail their senders when cancelled
+        in_flight = list(self._in_flight)
+        for task in in_flight:
+            task.cancel()
+        await asyncio.gather(*in_flight, return_exceptions=True)
+        
+        # Anything still queued never reached the flusher's current batch
+        self._fail_pending()
+        if self._owns_client:
+            await self._httpx_client.aclose()
 
 
 class RemoteAgentManager:
     """Manages connections to remote agents."""
     
-    def __init__(self):
+    def __init__(self, service_id: str = "orchestrator"):
         self.connections: Dict[str, RemoteAgentConnection] = {}
         self.agent_urls: Dict[str, str] = {}
+        
+        # Bumped on every change to connections so callers can drop cached lookups
+        self.version = 0
+        
+        # One pooled client shared by card discovery and every connection
+        # made as this manager's service
+        self.service_id = service_id
+        self.security = A2ASecurityMiddleware(service_id)
+        self._client = self._new_client()
+    
+    def _new_client(self) -> httpx.AsyncClient:
+        """Create the pooled client that adds this manager's security headers."""
+        return httpx.AsyncClient(
+            timeout=30,
+            http2=True,
+            limits=AGENT_HTTP_LIMITS,
+            event_hooks={
+                "request": [self._add_security_headers],
+                "response": [self._check_auth_response],
+            }
+        )
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared client, reopening it if close_all() closed it."""
+        if self._client.is_closed:
+            self._client = self._new_client()
+        return self._client
+    
+    async def _add_security_headers(self, request):
+        """Add security headers to outgoing requests on the shared client."""
+        request.headers.update(self.security.get_auth_headers())
+    
+    async def _check_auth_response(self, response):
+        """Re-mint the cached token if an agent rejected it."""
+        if response.status_code == 401:
+            self.security.invalidate_auth_headers()
     
     async def add_agent(self, agent_url: str, service_id: str = "orchestrator") -> Optional[RemoteAgentConnection]:
         """Add a remote agent by URL."""
         try:
-            # Create security middleware for the request
-            security = A2ASecurityMiddleware(service_id)
+            # Cards are always resolved over the shared keep-alive client so
+            # agents behind one host reuse its connection
+            shared = self._get_client()
+            card = await A2ACardResolver(shared, agent_url).get_agent_card()
             
-            # Create temporary client to get agent card
-            async def add_auth_headers(request):
-                headers = dict(request.headers)
-                headers = await security.add_auth_header(headers)
-                request.headers = httpx.Headers(headers)
+            # A different identity needs its own auth headers, so its
+            # connection creates and owns a dedicated client
+            client = shared if service_id == self.service_id else None
             
-            async with httpx.AsyncClient(
-                timeout=30,
-                event_hooks={"request": [add_auth_headers]}
-            ) as client:
-                from a2a.client import A2ACardResolver
-                card_resolver = A2ACardResolver(client, agent_url)
-                card = await card_resolver.get_agent_card()
-            
-            # Create connection with security
-            connection = RemoteAgentConnection(card, agent_url, service_id)
-            agent_name = connection.get_agent_name()
-            
-            self.connections[agent_name] = connection
-            self.agent_urls[agent_name] = agent_url
-            
-            print(f"Successfully connected to {agent_name}")
-            return connection
+            return self._register(card, agent_url, service_id, client)
             
         except Exception as e:
-            print(f"Failed to connect to agent at {agent_url}: {e}")
+            logger.warning("Failed to connect to agent at %s: %s", agent_url, e)
             return None
     
+    async def add_agents(self, agent_urls: List[str]) -> List[Optional[RemoteAgentConnection]]:
+        """Add several agents as this manager's service, resolving all cards concurrently."""
+        shared = self._get_client()
+        cards = await asyncio.gather(
+            *(A2ACardResolver(shared, url).get_agent_card() for url in agent_urls),
+            return_exceptions=True
+        )
+        
+        # Building connections does no I/O, so registration stays sequential
+        connections = []
+        for agent_url, card in zip(agent_urls, cards):
+            if isinstance(card, Exception):
+                logger.warning("Failed to connect to agent at %s: %s", agent_url, card)
+                connections.append(None)
+            else:
+                connections.append(self._register(card, agent_url, self.service_id, shared))
+        return connections
+    
+    def _register(self, card: AgentCard, agent_url: str, service_id: str,
+                  client: Optional[httpx.AsyncClient]) -> RemoteAgentConnection:
+        """Create a connection for a resolved card and make it available by name."""
+        # Create connection with security
+        connection = RemoteAgentConnection(card, agent_url, service_id, client=client)
+        agent_name = connection.get_agent_name()
+        
+        self.connections[agent_name] = connection
+        self.agent_urls[agent_name] = agent_url
+        self.version += 1
+        
+        logger.debug("Successfully connected to %s", agent_name)
+        return connection
+    
     def get_connection(self, agent_name: str) -> Optional[RemoteAgentConnection]:
         """Get a connection by agent name."""
         return self.connections.get(agent_name)
@@ -124,7 +297,9 @@ class RemoteAgentManager:
         }
     
     async def close_all(self):
-        """Close all connections."""
+        """Close all connections; the manager can still add agents afterwards."""
         for connection in self.connections.values():
             await connection.close()
-        self.connections.clear()
\ No newline at end of file
+        self.connections.clear()
+        self.version += 1
+        await self._client.aclose()
\ No newline at end of file
@@ -3,17 +3,33 @@ Tools for the Orchestrator Agent.
 """
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
+from functools import lru_cache
 import logging
+import re
 
 from ...shared.models import TravelPreferences, ConflictInfo
 
 
 logger = logging.getLogger(__name__)
 
+# Keywords in conflict descriptions that select an automatic resolution
+_TIMING_RE = re.compile(r"late_arrival|overlap", re.IGNORECASE)
+_LOCATION_RE = re.compile(r"distance", re.IGNORECASE)
+
 
 class TaskAnalyzer:
     """Analyzes travel requests and creates task assignments."""
     
+    # One pass over the destination matches every keyword group; group order
+    # is also the classification priority
+    _CLASSIFIER = re.compile(
+        r"(?P<major_city>paris|london|tokyo|new york)"
+        r"|(?P<beach>beach|coast|island)"
+        r"|(?P<nature>mountain|park|forest)",
+        re.IGNORECASE,
+    )
+    _CLASS_PRIORITY = ("major_city", "beach", "nature")
+    
     def __init__(self):
         self.budget_allocations = {
             "hotel": 0.35,      # 35% of budget
@@ -21,6 +37,29 @@ class TaskAnalyzer:
             "activities": 0.20, # 20% of budget
             "buffer": 0.15      # 15% buffer
         }
+        
+        # Ratios with the trip adjustments already folded in, keyed by
+        # (long_trip, group_trip): longer trips need more hotel budget and
+        # groups need different allocations
+        self._alloc_keys = ("hotel_budget", "transport_budget", "activities_budget", "buffer")
+        base = (
+            self.budget_allocations["hotel"],
+            self.budget_allocations["transport"],
+            self.budget_allocations["activities"],
+            self.budget_allocations["buffer"],
+        )
+        self._alloc_table = {}
+        for long_trip in (False, True):
+            for group_trip in (False, True):
+                multipliers = (
+                    (1.1 if long_trip else 1.0) * (0.95 if group_trip else 1.0),
+                    1.15 if group_trip else 1.0,
+                    0.9 if long_trip else 1.0,
+                    1.0,
+                )
+                self._alloc_table[long_trip, group_trip] = tuple(
+                    ratio * multiplier for ratio, multiplier in zip(base, multipliers)
+                )
     
     async def analyze_request(self, preferences: TravelPreferences,
                             total_budget: float, spent: float,
@@ -30,22 +69,9 @@ class TaskAnalyzer:
         # Calculate trip duration
         trip_days = (preferences.end_date - preferences.start_date).days
         
-        # Allocate budget based on percentages
-        allocations = {
-            "hotel_budget": available * self.budget_allocations["hotel"],
-            "transport_budget": available * self.budget_allocations["transport"],
-            "activities_budget": available * self.budget_allocations["activities"],
-            "buffer": available * self.budget_allocations["buffer"]
-        }
-        
-        # Adjust based on trip characteristics
-        if trip_days > 7:  # Longer trips need more hotel budget
-            allocations["hotel_budget"] *= 1.1
-            allocations["activities_budget"] *= 0.9
-        
-        if preferences.travelers > 2:  # Groups need different allocations
-            allocations["transport_budget"] *= 1.15
-            allocations["hotel_budget"] *= 0.95
+        # Allocate budget based on percentages, adjusted for trip characteristics
+        ratios = self._alloc_table[trip_days > 7, preferences.travelers > 2]
+        allocations = dict(zip(self._alloc_keys, (available * ratio for ratio in ratios)))
         
         # Identify priorities based on preferences
         priorities = self._determine_priorities(preferences)
@@ -88,24 +114,24 @@ class TaskAnalyzer:
         
         return priorities
     
-    def _is_international(self, origin: str, destination: str) -> bool:
+    # Both checks are pure functions of their strings, so results are cached
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _is_international(origin: str, destination: str) -> bool:
         """Simple check if travel is international."""
         # In a real implementation, this would use geocoding
         # For now, simple heuristic
         return origin.lower().split(",")[-1].strip() != destination.lower().split(",")[-1].strip()
     
-    def _classify_destination(self, destination: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _classify_destination(destination: str) -> str:
         """Classify destination type."""
-        destination_lower = destination.lower()
-        
-        if any(city in destination_lower for city in ["paris", "london", "tokyo", "new york"]):
-            return "major_city"
-        elif any(beach in destination_lower for beach in ["beach", "coast", "island"]):
-            return "beach"
-        elif any(nature in destination_lower for nature in ["mountain", "park", "forest"]):
-            return "nature"
-        else:
-            return "general"
+        matched = {m.lastgroup for m in TaskAnalyzer._CLASSIFIER.finditer(destination)}
+        for destination_type in TaskAnalyzer._CLASS_PRIORITY:
+            if destination_type in matched:
+                return destination_type
+        return "general"
 
 
 class ConflictResolver:
@@ -142,9 +168,10 @@ class ConflictResolver:
                                      bookings: Dict[str, List[Dict[str, Any]]],
                                      preferences: Dict[str, Any]) -> Dict[str, Any]:
         """Resolve timing conflicts between bookings."""
+        keywords = {m.group(0).lower() for m in _TIMING_RE.finditer(conflict.description)}
         
         # Example: Flight arrives after hotel check-in time
-        if "late_arrival" in conflict.description.lower():
+        if "late_arrival" in keywords:
             return {
                 "can_resolve": True,
                 "instructions": {
@@ -157,7 +184,7 @@ class ConflictResolver:
             }
         
         # Example: Activity overlaps with transport
-        if "overlap" in conflict.description.lower():
+        if "overlap" in keywords:
             return {
                 "can_resolve": True,
                 "instructions": {
@@ -216,7 +243,7 @@ class ConflictResolver:
         """Resolve location conflicts."""
         
         # Example: Activity too far from hotel
-        if "distance" in conflict.description.lower():
+        if _LOCATION_RE.search(conflict.description):
             return {
                 "can_resolve": True,
                 "instructions": {
@@ -254,51 +281,71 @@ class DependencyManager:
             "budget": set(),  # Budget monitors all
             "itinerary": {"hotel", "transport", "activity"}  # Itinerary needs all bookings
         }
-    
-    def get_ready_agents(self, completed_agents: set) -> List[str]:
-        """Get agents that are ready to execute based on completed dependencies."""
-        ready = []
         
-        for agent, dependencies in self.dependency_graph.items():
-            if agent not in completed_agents:
-                if dependencies.issubset(completed_agents):
-                    ready.append(agent)
-        
-        return ready
+        # The graph is static, so everything derived from it is computed once
+        self._all_agents = frozenset(self.dependency_graph)
+        self._deps = {
+            agent: frozenset(deps) for agent, deps in self.dependency_graph.items()
+        }
+        self._dependents: Dict[str, List[str]] = {agent: [] for agent in self._deps}
+        for agent, deps in self._deps.items():
+            for dep in deps:
+                self._dependents.setdefault(dep, []).append(agent)
+        self._levels = self._compute_levels()
     
-    def get_execution_order(self) -> List[List[str]]:
-        """Get the execution order respecting dependencies."""
-        # Topological sort
-        visited = set()
-        order = []
-        
-        def visit(agent):
-            if agent in visited:
-                return
-            visited.add(agent)
-            for dep in self.dependency_graph.get(agent, set()):
-                visit(dep)
-            order.append(agent)
+    def _compute_levels(self) -> List[List[str]]:
+        """Group agents into parallel levels with Kahn's algorithm."""
+        remaining = {agent: len(deps) for agent, deps in self._deps.items()}
+        dependents = self._dependents
         
-        for agent in self.dependency_graph:
-            visit(agent)
-        
-        # Group by levels (agents that can run in parallel)
         levels = []
-        placed = set()
-        
-        while placed != set(order):
-            level = []
-            for agent in order:
-                if agent not in placed:
-                    deps = self.dependency_graph.get(agent, set())
-                    if deps.issubset(placed):
-                        level.append(agent)
+        level = [agent for agent, count in remaining.items() if count == 0]
+        while level:
             levels.append(level)
-            placed.update(level)
+            next_level = []
+            for agent in level:
+                for dependent in dependents.get(agent, ()):
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        next_level.append(dependent)
+            level = next_level
+        
+        if sum(len(level) for level in levels) != len(self._all_agents):
+            raise ValueError("Dependency graph contains a cycle")
         
         return levels
     
+    def new_progress(self) -> Dict[str, int]:
+        """Return unmet dependency counts for tracking one session with mark_complete."""
+        return {agent: len(deps) for agent, deps in self._deps.items()}
+    
+    def mark_complete(self, agent: str, progress: Dict[str, int]) -> List[str]:
+        """Record an agent as complete in progress and return the agents it made ready."""
+        # Completed agents leave progress, so a repeat completion is a no-op
+        if progress.pop(agent, None) is None:
+            return []
+        
+        ready = []
+        for dependent in self._dependents.get(agent, ()):
+            if dependent in progress:
+                progress[dependent] -= 1
+                if progress[dependent] == 0:
+                    ready.append(dependent)
+        return ready
+    
+    def get_ready_agents(self, completed_agents: set) -> List[str]:
+        """Get agents that are ready to execute based on completed dependencies."""
+        completed = frozenset(completed_agents)
+        return [
+            agent for agent, deps in self._deps.items()
+            if agent not in completed and deps <= completed
+        ]
+    
+    def get_execution_order(self) -> List[List[str]]:
+        """Get the execution order respecting dependencies."""
+        # Copied so callers cannot reorder the cached levels
+        return [list(level) for level in self._levels]
+    
     def validate_completion_order(self, completion_order: List[str]) -> Tuple[bool, Optional[str]]:
         """Validate that agents completed in valid order."""
         completed = set()
@@ -24,7 +24,7 @@ from starlette.requests import Request
 from starlette.responses import JSONResponse
 
 from .agent_executor import TransportAgentExecutor
-from ...security.auth import security_manager, get_ssl_context, A2ASecurityMiddleware
+from ...security.auth import security_manager, get_ssl_context, A2ASecurityMiddleware, PUBLIC_PATHS, is_trusted_host
 
 
 load_dotenv()
@@ -119,13 +119,13 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         self.security = A2ASecurityMiddleware(service_id)
     
     async def dispatch(self, request: Request, call_next):
-        # Skip security for health check
-        if request.url.path == "/health":
+        # Skip security for public endpoints and trusted internal callers
+        client_host = request.client.host if request.client else None
+        if request.url.path in PUBLIC_PATHS or is_trusted_host(client_host):
             return await call_next(request)
         
         # Verify incoming request
-        headers = dict(request.headers)
-        is_valid, requester = await self.security.verify_incoming_request(headers)
+        is_valid, requester = await self.security.verify_incoming_request(request.headers)
         
         if not is_valid:
             return JSONResponse(
@@ -137,7 +137,7 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         request.state.requester = requester
         
         # Check rate limit
-        if not security_manager.check_rate_limit(requester or request.client.host):
+        if not security_manager.check_rate_limit(requester or client_host):
             return JSONResponse(
                 status_code=429,
                 content={"error": "Rate limit exceeded"}
@@ -172,11 +172,18 @@ if __name__ == "__main__":
             "ssl_certfile": os.getenv("SSL_CERT_FILE", "certs/server.crt"),
         }
     
-    # Run the server
+    # Extra workers need the app as an import string. The task store is
+    # in-memory and per process, so only scale out behind sticky routing.
+    workers = int(os.getenv("TRANSPORT_WORKERS", "1"))
+    
+    # Run the server; "auto" picks uvloop and httptools when installed
     uvicorn.run(
-        app,
+        "src.agents.transport.__main__:app" if workers > 1 else app,
         host="0.0.0.0",
         port=port,
+        loop="auto",
+        http="auto",
+        workers=workers,
         log_level="info",
         **ssl_config
     )
\ No newline at end of file
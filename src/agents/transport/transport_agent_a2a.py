@@ -2,23 +2,59 @@
 Transport Agent implementation for A2A protocol.
 """
 import asyncio
-import json
 import random
-from typing import Any, AsyncIterable, Dict, List
-from datetime import datetime, timedelta
+from typing import Any, AsyncIterable, Dict, List, Optional
+from datetime import date, datetime, timedelta
 import uuid
 
+import orjson
+from cachetools import TTLCache
 from langchain_core.messages import AIMessage, ToolMessage
 from langchain_core.tools import tool
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.prebuilt import create_react_agent
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from ...shared.llm_config import LLMConfig
 
 
 memory = MemorySaver()
 
+# Serialized search results keyed by the raw tool arguments; identical
+# searches within the TTL return the same options instead of regenerating them
+_FLIGHT_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=600)
+
+# Mock airline catalogue as (name, two-letter code) pairs
+AIRLINE_CODES = tuple(
+    (airline, airline[:2].upper())
+    for airline in ("American Airlines", "United Airlines", "Delta", "Southwest",
+                    "JetBlue", "British Airways", "Lufthansa")
+)
+
+# Shared RNG for mock results; seed it in tests for determinism
+_RNG = random.Random()
+
+# Options generated per search
+FLIGHTS_PER_SEARCH = 5
+
+# Stop counts and their weights; most flights are direct
+STOPS_VALUES = (0, 1, 2)
+STOPS_WEIGHTS = (3, 2, 1)
+
+# Fare multiplier per cabin class
+CLASS_MULT = {"economy": 1.0, "business": 2.5, "first": 4.0}
+
+# City pairs with a viable rail alternative, in either direction
+TRAIN_PAIRS = frozenset(
+    frozenset(pair) for pair in (
+        ("New York", "Boston"), ("London", "Paris"), ("Tokyo", "Osaka"),
+        ("New York", "Washington")
+    )
+)
+
+# Window over which streamed status updates are merged into one event
+STREAM_COALESCE_SECONDS = 0.05
+
 
 class FlightSearchInput(BaseModel):
     """Input schema for flight search."""
@@ -31,15 +67,38 @@ class FlightSearchInput(BaseModel):
     max_budget: float = Field(..., description="Maximum budget for the flight")
 
 
+class Flight(BaseModel):
+    """A flight option as returned by search_flights."""
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+    
+    flight_number: str = Field("", description="Flight number")
+    airline: str = Field("Unknown", description="Operating airline")
+    origin: str = Field("", description="Origin airport or city")
+    destination: str = Field("", description="Destination airport or city")
+    departure: str = Field("N/A", description="Departure time in ISO format")
+    arrival: str = Field("N/A", description="Arrival time in ISO format")
+    duration_hours: float = Field(0, description="Flight duration in hours")
+    cabin_class: str = Field("economy", alias="class", description="Flight class")
+    price_per_passenger: float = Field(0, description="Price per passenger")
+    total_price: float = Field(0, description="Total price for all passengers")
+    stops: int = Field(0, description="Number of stops")
+    available_seats: int = Field(0, description="Seats still available")
+
+
 class TransportResponseFormat(BaseModel):
     """Response format for transport agent."""
     status: str = Field("completed", description="Status of the response")
     message: str = Field(..., description="Response message")
-    flights: List[Dict[str, Any]] = Field(default_factory=list, description="List of flights found")
-    selected_option: Dict[str, Any] = Field(default=None, description="Recommended transport option")
+    flights: List[Flight] = Field(default_factory=list, description="List of flights found")
+    selected_option: Optional[Flight] = Field(default=None, description="Recommended transport option")
     alternative_transport: List[Dict[str, Any]] = Field(default_factory=list, description="Alternative transport modes")
 
 
+def _dumps(obj: Any) -> str:
+    """Serialize a tool result to a JSON string."""
+    return orjson.dumps(obj).decode()
+
+
 @tool(args_schema=FlightSearchInput)
 async def search_flights(
     origin: str,
@@ -51,88 +110,108 @@ async def search_flights(
     max_budget: float = 1000.0
 ) -> str:
     """Search for flights between origin and destination."""
+    key = (origin, destination, departure_date, return_date, passengers, class_type, max_budget)
+    cached = _FLIGHT_CACHE.get(key)
+    if cached is not None:
+        return cached
+    
     try:
-        # Parse dates
-        dep_date = datetime.strptime(departure_date, "%Y-%m-%d")
-        ret_date = datetime.strptime(return_date, "%Y-%m-%d") if return_date else None
-        
-        # Mock flight data
-        airlines = ["American Airlines", "United Airlines", "Delta", "Southwest", "JetBlue", "British Airways", "Lufthansa"]
+        result = _search_flights_impl(
+            origin, destination, departure_date, return_date,
+            passengers, class_type, max_budget
+        )
+    except Exception as e:
+        return _dumps({
+            "error": f"Error searching flights: {str(e)}"
+        })
+    
+    _FLIGHT_CACHE[key] = result
+    return result
+
+
+def _search_flights_impl(
+    origin: str,
+    destination: str,
+    departure_date: str,
+    return_date: str,
+    passengers: int,
+    class_type: str,
+    max_budget: float
+) -> str:
+    """Generate mock flight results and return them serialized."""
+    # Parse dates
+    dep_date = date.fromisoformat(departure_date)
+    ret_date = date.fromisoformat(return_date) if return_date else None
+    
+    # Loop invariants bound once
+    rng = _RNG
+    mult = CLASS_MULT.get(class_type, 1.0)
+    rand_u = rng.uniform
+    rand_i = rng.randint
+    dep_year, dep_month, dep_day = dep_date.year, dep_date.month, dep_date.day
+    
+    # Categorical draws for every candidate flight in one call each
+    n = FLIGHTS_PER_SEARCH
+    picks = zip(
+        rng.choices(AIRLINE_CODES, k=n),
+        rng.choices((0, 30), k=n),
+        rng.choices(STOPS_VALUES, weights=STOPS_WEIGHTS, k=n),
+    )
+    
+    flights = []
+    
+    # Generate outbound flights
+    for (airline, code), minute, stops in picks:
+        base_price = rand_u(200, 800) * mult
         
-        flights = []
+        # Adjust by number of passengers
+        total_price = base_price * passengers
         
-        # Generate outbound flights
-        for i in range(5):
-            airline = random.choice(airlines)
-            base_price = random.uniform(200, 800)
-            
-            # Adjust price by class
-            if class_type == "business":
-                base_price *= 2.5
-            elif class_type == "first":
-                base_price *= 4
-            
-            # Adjust by number of passengers
-            total_price = base_price * passengers
+        if total_price <= max_budget:
+            departure_time = datetime(dep_year, dep_month, dep_day, rand_i(6, 22), minute)
+            duration_hours = rand_u(1, 12)
+            arrival_time = departure_time + timedelta(hours=duration_hours)
             
-            if total_price <= max_budget:
-                departure_time = dep_date.replace(
-                    hour=random.randint(6, 22),
-                    minute=random.choice([0, 30])
-                )
-                duration_hours = random.uniform(1, 12)
-                arrival_time = departure_time + timedelta(hours=duration_hours)
-                
-                flight = {
-                    "flight_number": f"{airline[:2].upper()}{random.randint(100, 999)}",
-                    "airline": airline,
-                    "origin": origin,
-                    "destination": destination,
-                    "departure": departure_time.isoformat(),
-                    "arrival": arrival_time.isoformat(),
-                    "duration_hours": round(duration_hours, 1),
-                    "class": class_type,
-                    "price_per_passenger": round(base_price, 2),
-                    "total_price": round(total_price, 2),
-                    "stops": random.choice([0, 0, 0, 1, 1, 2]),  # More likely to be direct
-                    "available_seats": random.randint(1, 20)
-                }
-                flights.append(flight)
-        
-        # Sort by price
-        flights.sort(key=lambda x: x["total_price"])
-        
-        # Also suggest alternative transport for certain routes
-        alternatives = []
-        
-        # Check if train is viable (for certain city pairs)
-        train_routes = [
-            ("New York", "Boston"), ("London", "Paris"), ("Tokyo", "Osaka"),
-            ("Paris", "London"), ("New York", "Washington")
-        ]
-        
-        if any((origin in route and destination in route) for route in train_routes):
-            train_price = random.uniform(50, 200) * passengers
-            alternatives.append({
-                "mode": "train",
-                "provider": "High-Speed Rail",
-                "duration_hours": random.uniform(2, 5),
-                "price": round(train_price, 2),
-                "comfort": "high",
-                "eco_friendly": True
-            })
-        
-        return json.dumps({
-            "found": len(flights),
-            "flights": flights[:5],  # Top 5 options
-            "alternatives": alternatives,
-            "best_option": flights[0] if flights else None
-        })
-        
-    except Exception as e:
-        return json.dumps({
-            "error": f"Error searching flights: {str(e)}"
+            flight = {
+                "flight_number": f"{code}{rand_i(100, 999)}",
+                "airline": airline,
+                "origin": origin,
+                "destination": destination,
+                "departure": departure_time.isoformat(),
+                "arrival": arrival_time.isoformat(),
+                "duration_hours": round(duration_hours, 1),
+                "class": class_type,
+                "price_per_passenger": round(base_price, 2),
+                "total_price": round(total_price, 2),
+                "stops": stops,
+                "available_seats": rand_i(1, 20)
+            }
+            flights.append(flight)
+    
+    # Sort by price
+    flights.sort(key=lambda x: x["total_price"])
+    
+    # Also suggest alternative transport for certain routes
+    alternatives = []
+    
+    # Check if train is viable (for certain city pairs)
+    if frozenset((origin.strip().title(), destination.strip().title())) in TRAIN_PAIRS:
+        train_price = rng.uniform(50, 200) * passengers
+        alternatives.append({
+            "mode": "train",
+            "provider": "High-Speed Rail",
+            "duration_hours": rng.uniform(2, 5),
+            "price": round(train_price, 2),
+            "comfort": "high",
+            "eco_friendly": True
         })
+    
+    return _dumps({
+        "found": len(flights),
+        "flights": flights[:5],  # Top 5 options
+        "alternatives": alternatives,
+        "best_option": flights[0] if flights else None
+    })
 
 
 class TransportAgentA2A:
@@ -184,27 +263,57 @@ Remember: You're part of a travel planning system. Consider hotel check-in times
         
         inputs = {"messages": [("user", augmented_query)]}
         
-        # Stream processing
-        for item in self.graph.stream(inputs, config, stream_mode="values"):
-            message = item["messages"][-1]
+        # The graph runs in a producer task; updates are coalesced here so a
+        # burst of steps is reported as one event
+        updates: asyncio.Queue = asyncio.Queue()
+        producer = asyncio.create_task(self._produce_updates(inputs, config, updates))
+        last_update = None
+        
+        try:
+            done = False
+            while not done:
+                pending = [await updates.get()]
+                if pending[0] is not None:
+                    await asyncio.sleep(STREAM_COALESCE_SECONDS)
+                while not updates.empty():
+                    pending.append(updates.get_nowait())
+                
+                # The end-of-stream marker is always the last item queued
+                done = pending[-1] is None
+                latest = next((u for u in reversed(pending) if u is not None), None)
+                
+                # Skip repeats of the status the client already has
+                if latest is not None and latest != last_update:
+                    last_update = latest
+                    yield {
+                        "is_task_complete": False,
+                        "updates": latest
+                    }
             
-            if isinstance(message, AIMessage) and message.tool_calls:
-                yield {
-                    "is_task_complete": False,
-                    "updates": "Searching for flights..."
-                }
-            elif isinstance(message, ToolMessage):
-                yield {
-                    "is_task_complete": False,
-                    "updates": "Analyzing transport options..."
-                }
+            # Surface any error raised while running the graph
+            await producer
+        finally:
+            producer.cancel()
         
         # Get final response
-        yield self._get_final_response(config)
+        yield await self._get_final_response(config)
+    
+    async def _produce_updates(self, inputs, config, updates: asyncio.Queue):
+        """Run the graph and queue a status update per step, then None."""
+        try:
+            async for item in self.graph.astream(inputs, config, stream_mode="values"):
+                message = item["messages"][-1]
+                
+                if isinstance(message, AIMessage) and message.tool_calls:
+                    updates.put_nowait("Searching for flights...")
+                elif isinstance(message, ToolMessage):
+                    updates.put_nowait("Analyzing transport options...")
+        finally:
+            updates.put_nowait(None)
     
-    def _get_final_response(self, config) -> Dict[str, Any]:
+    async def _get_final_response(self, config) -> Dict[str, Any]:
         """Get the final response from the agent."""
-        current_state = self.graph.get_state(config)
+        current_state = await self.graph.aget_state(config)
         structured_response = current_state.values.get("structured_response")
         
         if structured_response and isinstance(structured_response, TransportResponseFormat):
@@ -213,16 +322,18 @@ Remember: You're part of a travel planning system. Consider hotel check-in times
             if structured_response.flights:
                 content_parts.append(f"\n✈️ Found {len(structured_response.flights)} flight options:\n")
                 
-                for i, flight in enumerate(structured_response.flights[:3], 1):
-                    content_parts.append(f"\n{i}. **{flight.get('airline', 'Unknown')} - {flight.get('flight_number', '')}**")
-                    content_parts.append(f"   Departure: {flight.get('departure', 'N/A')}")
-                    content_parts.append(f"   Duration: {flight.get('duration_hours', 0)} hours")
-                    content_parts.append(f"   Stops: {flight.get('stops', 0)}")
-                    content_parts.append(f"   Price: ${flight.get('total_price', 0):.2f} total")
+                content_parts.extend([
+                    f"\n{i}. **{flight.airline} - {flight.flight_number}**\n"
+                    f"   Departure: {flight.departure}\n"
+                    f"   Duration: {flight.duration_hours} hours\n"
+                    f"   Stops: {flight.stops}\n"
+                    f"   Price: ${flight.total_price:.2f} total"
+                    for i, flight in enumerate(structured_response.flights[:3], 1)
+                ])
             
             if structured_response.selected_option:
                 flight = structured_response.selected_option
-                content_parts.append(f"\n**Recommended: {flight.get('airline')} {flight.get('flight_number')}**")
+                content_parts.append(f"\n**Recommended: {flight.airline} {flight.flight_number}**")
                 content_parts.append(f"Best balance of price, duration, and convenience.")
             
             if structured_response.alternative_transport:
@@ -234,8 +345,13 @@ Remember: You're part of a travel planning system. Consider hotel check-in times
                 "is_task_complete": True,
                 "content": "\n".join(content_parts),
                 "data": {
-                    "flights": structured_response.flights,
-                    "selected": structured_response.selected_option,
+                    "flights": [
+                        flight.model_dump(by_alias=True) for flight in structured_response.flights
+                    ],
+                    "selected": (
+                        structured_response.selected_option.model_dump(by_alias=True)
+                        if structured_response.selected_option else None
+                    ),
                     "alternatives": structured_response.alternative_transport
                 }
             }
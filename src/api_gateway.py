@@ -10,18 +10,22 @@ the travel agent system. It handles:
 """
 import os
 import logging
+import time
+from contextlib import asynccontextmanager
 from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import timedelta
 import uuid
 
 from fastapi import FastAPI, HTTPException, Depends, Security, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel, Field
 import httpx
+import orjson
 from dotenv import load_dotenv
 
-from .security.auth import security_manager, rate_limit
+from .security.auth import security_manager, rate_limit, API_KEY_HEADER
 from .agents.orchestrator.remote_agent_connection import RemoteAgentConnection
 
 
@@ -34,12 +38,43 @@ logger = logging.getLogger(__name__)
 ORCHESTRATOR_URL = os.getenv("ORCHESTRATOR_URL", "http://localhost:10001")
 API_GATEWAY_PORT = int(os.getenv("API_GATEWAY_PORT", "8080"))
 
+# The gateway calls the orchestrator with the client API key; it never
+# changes at runtime, so the header is built once. It must come from the
+# environment: a generated key would be unknown to the orchestrator process
+CLIENT_API_KEY = os.getenv("CLIENT_API_KEY")
+ORCHESTRATOR_AUTH_HEADERS = {API_KEY_HEADER: CLIENT_API_KEY or ""}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Hold one pooled orchestrator client for the lifetime of the app."""
+    if not CLIENT_API_KEY:
+        raise RuntimeError(
+            "CLIENT_API_KEY is not set; the gateway cannot authenticate to the orchestrator"
+        )
+    
+    app.state.http = httpx.AsyncClient(
+        timeout=httpx.Timeout(60.0, connect=5.0),
+        http2=True,
+        limits=httpx.Limits(
+            max_keepalive_connections=100,
+            max_connections=500,
+            keepalive_expiry=30.0
+        )
+    )
+    try:
+        yield
+    finally:
+        await app.state.http.aclose()
+
 
 # FastAPI app
 app = FastAPI(
     title="Travel Agent System API",
     description="API Gateway for the Travel Agent System",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 
@@ -56,7 +91,6 @@ app.add_middleware(
 # Security
 security = HTTPBearer()
 
-
 # Request/Response models
 class AuthRequest(BaseModel):
     """Authentication request."""
@@ -205,8 +239,7 @@ async def plan_travel(
     """Submit a travel planning request."""
     try:
         # Add authentication headers for orchestrator
-        headers = {}
-        headers = await security_manager.security_manager.add_auth_header(headers)
+        headers = ORCHESTRATOR_AUTH_HEADERS
         
         # Create A2A message format
         a2a_request = {
@@ -223,28 +256,27 @@ async def plan_travel(
         }
         
         # Send to orchestrator
-        async with httpx.AsyncClient(timeout=60) as client:
-            response = await client.post(
-                f"{ORCHESTRATOR_URL}/send_message",
-                json=a2a_request,
-                headers=headers
-            )
-            
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Orchestrator error: {response.text}"
-                )
-            
-            result = response.json()
-            
-            return TravelResponse(
-                status="submitted",
-                task_id=result.get("task_id", str(uuid.uuid4())),
-                message="Your travel planning request has been submitted",
-                data=result
+        response = await app.state.http.post(
+            f"{ORCHESTRATOR_URL}/send_message",
+            json=a2a_request,
+            headers=headers
+        )
+        
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Orchestrator error: {response.text}"
             )
-            
+        
+        result = response.json()
+        
+        return TravelResponse(
+            status="submitted",
+            task_id=result.get("task_id", str(uuid.uuid4())),
+            message="Your travel planning request has been submitted",
+            data=result
+        )
+        
     except httpx.RequestError as e:
         logger.error(f"Error connecting to orchestrator: {e}")
         raise HTTPException(status_code=503, detail="Service temporarily unavailable")
@@ -261,84 +293,97 @@ async def get_task_status(
     """Get the status of a travel planning task."""
     try:
         # Add authentication headers
-        headers = {}
-        headers = await security_manager.security_manager.add_auth_header(headers)
+        headers = ORCHESTRATOR_AUTH_HEADERS
         
         # Query orchestrator for task status
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(
-                f"{ORCHESTRATOR_URL}/tasks/{task_id}",
-                headers=headers
+        response = await app.state.http.get(
+            f"{ORCHESTRATOR_URL}/tasks/{task_id}",
+            headers=headers,
+            timeout=30
+        )
+        
+        if response.status_code == 404:
+            raise HTTPException(status_code=404, detail="Task not found")
+        elif response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Error retrieving task: {response.text}"
             )
-            
-            if response.status_code == 404:
-                raise HTTPException(status_code=404, detail="Task not found")
-            elif response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Error retrieving task: {response.text}"
-                )
-            
-            return response.json()
-            
+        
+        return response.json()
+        
     except httpx.RequestError as e:
         logger.error(f"Error connecting to orchestrator: {e}")
         raise HTTPException(status_code=503, detail="Service temporarily unavailable")
 
 
+# The agent roster is static, so it is serialized once at import
+_AGENTS_PAYLOAD = {"agents": [
+    {
+        "name": "Orchestrator",
+        "description": "Coordinates all travel planning activities",
+        "status": "active",
+        "capabilities": ["planning", "coordination", "task_distribution"]
+    },
+    {
+        "name": "Hotel Agent",
+        "description": "Finds and books accommodations",
+        "status": "active",
+        "capabilities": ["hotel_search", "price_comparison", "booking"]
+    },
+    {
+        "name": "Transport Agent",
+        "description": "Arranges flights and transportation",
+        "status": "active",
+        "capabilities": ["flight_search", "route_planning", "booking"]
+    },
+    {
+        "name": "Budget Agent",
+        "description": "Manages travel budget and expenses",
+        "status": "active",
+        "capabilities": ["budget_tracking", "expense_validation", "cost_optimization"]
+    }
+]}
+_AGENTS_RESPONSE_BYTES = orjson.dumps(_AGENTS_PAYLOAD)
+
+
 @app.get("/agents")
 async def list_agents(user: UserSession = Depends(get_current_user)):
     """List all available agents in the system."""
-    agents = [
-        {
-            "name": "Orchestrator",
-            "description": "Coordinates all travel planning activities",
-            "status": "active",
-            "capabilities": ["planning", "coordination", "task_distribution"]
-        },
-        {
-            "name": "Hotel Agent",
-            "description": "Finds and books accommodations",
-            "status": "active",
-            "capabilities": ["hotel_search", "price_comparison", "booking"]
-        },
-        {
-            "name": "Transport Agent",
-            "description": "Arranges flights and transportation",
-            "status": "active",
-            "capabilities": ["flight_search", "route_planning", "booking"]
-        },
-        {
-            "name": "Budget Agent",
-            "description": "Manages travel budget and expenses",
-            "status": "active",
-            "capabilities": ["budget_tracking", "expense_validation", "cost_optimization"]
-        }
-    ]
-    
-    return {"agents": agents}
+    return Response(content=_AGENTS_RESPONSE_BYTES, media_type="application/json")
 
 
 # Error handlers
+_INTERNAL_ERROR = {"error": "Internal server error", "status_code": 500}
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time as an ISO 8601 string with second precision."""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Handle HTTP exceptions."""
-    return {
-        "error": exc.detail,
-        "status_code": exc.status_code,
-        "timestamp": datetime.utcnow().isoformat()
-    }
+    return ORJSONResponse(
+        status_code=exc.status_code,
+        content={
+            "error": exc.detail,
+            "status_code": exc.status_code,
+            "timestamp": _utc_timestamp()
+        },
+        headers=getattr(exc, "headers", None)
+    )
 
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     """Handle general exceptions."""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return {
-        "error": "Internal server error",
-        "status_code": 500,
-        "timestamp": datetime.utcnow().isoformat()
-    }
+    return ORJSONResponse(
+        status_code=500,
+        content={**_INTERNAL_ERROR, "timestamp": _utc_timestamp()}
+    )
 
 
 if __name__ == "__main__":
@@ -2,15 +2,19 @@
 Launch all travel agents as A2A servers.
 """
 import asyncio
-import subprocess
 import sys
-import time
 import os
 import signal
-from typing import List, Dict
+from typing import List, Dict, Optional
 import logging
+import httpx
 from dotenv import load_dotenv
 
+try:
+    from .shared.supervisor import supervise, use_pidfd_child_watcher
+except ImportError:  # run as a script (python src/launch_agents.py)
+    from shared.supervisor import supervise, use_pidfd_child_watcher
+
 
 load_dotenv()
 logging.basicConfig(level=logging.INFO)
@@ -58,15 +62,21 @@ AGENTS = {
     }
 }
 
+# Readiness probe; the agent card route is public on every agent
+AGENT_READY_PATH = "/.well-known/agent.json"
+AGENT_READY_TIMEOUT = float(os.getenv("AGENT_READY_TIMEOUT", "30"))
+AGENT_READY_POLL_INTERVAL = 0.1
+
 
 class AgentLauncher:
     """Manages launching and monitoring agent processes."""
     
     def __init__(self):
-        self.processes: Dict[str, subprocess.Popen] = {}
+        self.processes: Dict[str, asyncio.subprocess.Process] = {}
         self.running = True
+        self._main_task: Optional[asyncio.Task] = None
     
-    def start_agent(self, agent_id: str, config: Dict) -> subprocess.Popen:
+    async def start_agent(self, agent_id: str, config: Dict) -> asyncio.subprocess.Process:
         """Start a single agent process."""
         agent_name = config["name"]
         module = config["module"]
@@ -79,48 +89,63 @@ class AgentLauncher:
         env[config["env_var"]] = str(port)
         
         # Launch the agent
-        process = subprocess.Popen(
-            [sys.executable, "-m", module],
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", module,
             env=env,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
-            universal_newlines=True
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
         )
         
-        # Give it a moment to start
-        time.sleep(2)
+        # Track it right away so a shutdown during startup still stops it
+        self.processes[agent_id] = process
         
-        # Check if it started successfully
-        if process.poll() is None:
+        # Wait until it answers HTTP instead of sleeping a fixed amount
+        if await self._wait_until_ready(process, port):
             logger.info(f"✓ {agent_name} started successfully (PID: {process.pid})")
+        elif process.returncode is None:
+            logger.warning(f"{agent_name} not ready after {AGENT_READY_TIMEOUT}s (PID: {process.pid})")
         else:
             logger.error(f"✗ {agent_name} failed to start")
-            stdout, stderr = process.communicate()
+            stdout, stderr = await process.communicate()
             if stdout:
-                logger.error(f"STDOUT: {stdout}")
+                logger.error(f"STDOUT: {stdout.decode(errors='replace')}")
             if stderr:
-                logger.error(f"STDERR: {stderr}")
+                logger.error(f"STDERR: {stderr.decode(errors='replace')}")
         
         return process
     
-    def start_all_agents(self):
-        """Start all agents in the correct order."""
-        # Start agents without dependencies first
-        for agent_id, config in AGENTS.items():
-            if "depends_on" not in config:
-                self.processes[agent_id] = self.start_agent(agent_id, config)
+    async def _wait_until_ready(self, process: asyncio.subprocess.Process, port) -> bool:
+        """Poll the agent card endpoint until the agent answers or exits."""
+        scheme = "https" if os.getenv("USE_SSL", "false").lower() == "true" else "http"
+        url = f"{scheme}://localhost:{port}{AGENT_READY_PATH}"
+        deadline = asyncio.get_running_loop().time() + AGENT_READY_TIMEOUT
         
-        # Give base agents time to fully initialize
-        logger.info("Waiting for base agents to initialize...")
-        time.sleep(5)
+        async with httpx.AsyncClient(verify=False, timeout=0.5) as client:
+            while process.returncode is None and asyncio.get_running_loop().time() < deadline:
+                try:
+                    response = await client.get(url)
+                    if response.status_code == 200:
+                        return True
+                except httpx.HTTPError:
+                    pass
+                await asyncio.sleep(AGENT_READY_POLL_INTERVAL)
         
-        # Start agents with dependencies
-        for agent_id, config in AGENTS.items():
-            if "depends_on" in config:
-                logger.info(f"Starting {config['name']} (depends on: {config['depends_on']})")
-                self.processes[agent_id] = self.start_agent(agent_id, config)
+        return False
+    
+    async def start_all_agents(self):
+        """Start all agents in the correct order."""
+        # Boot agents without dependencies concurrently
+        await asyncio.gather(*(
+            self.start_agent(agent_id, config)
+            for agent_id, config in AGENTS.items()
+            if "depends_on" not in config
+        ))
+        
+        # Start agents with dependencies once the base agents answer
+        dependents = [(agent_id, config) for agent_id, config in AGENTS.items() if "depends_on" in config]
+        for agent_id, config in dependents:
+            logger.info(f"Starting {config['name']} (depends on: {config['depends_on']})")
+        await asyncio.gather(*(self.start_agent(agent_id, config) for agent_id, config in dependents))
         
         logger.info("\nAll agents started!")
         self.print_status()
@@ -133,7 +158,7 @@ class AgentLauncher:
         
         for agent_id, config in AGENTS.items():
             process = self.processes.get(agent_id)
-            if process and process.poll() is None:
+            if process and process.returncode is None:
                 port = os.getenv(config["env_var"], config["port"])
                 print(f"✓ {config['name']:<20} Running on port {port} (PID: {process.pid})")
             else:
@@ -150,31 +175,20 @@ class AgentLauncher:
         print("\nPress Ctrl+C to stop all agents")
         print("="*60 + "\n")
     
-    def monitor_agents(self):
+    async def monitor_agents(self):
         """Monitor agent processes and restart if needed."""
-        while self.running:
-            try:
-                # Check each agent
-                for agent_id, config in AGENTS.items():
-                    process = self.processes.get(agent_id)
-                    
-                    if process and process.poll() is not None:
-                        # Agent crashed
-                        logger.warning(f"{config['name']} stopped unexpectedly. Restarting...")
-                        self.processes[agent_id] = self.start_agent(agent_id, config)
-                
-                # Wait before next check
-                time.sleep(5)
-                
-            except KeyboardInterrupt:
-                break
+        await asyncio.gather(*(
+            supervise(self, agent_id, config)
+            for agent_id, config in AGENTS.items()
+            if agent_id in self.processes
+        ))
     
-    def stop_all_agents(self):
+    async def stop_all_agents(self):
         """Stop all running agents."""
         logger.info("\nStopping all agents...")
         
         for agent_id, process in self.processes.items():
-            if process and process.poll() is None:
+            if process and process.returncode is None:
                 agent_name = AGENTS[agent_id]["name"]
                 logger.info(f"Stopping {agent_name} (PID: {process.pid})")
                 
@@ -183,25 +197,39 @@ class AgentLauncher:
                 
                 # Wait up to 5 seconds for graceful shutdown
                 try:
-                    process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
+                    await asyncio.wait_for(process.wait(), timeout=5)
+                except asyncio.TimeoutError:
                     # Force kill if needed
                     logger.warning(f"Force killing {agent_name}")
                     process.kill()
-                    process.wait()
+                    await process.wait()
         
         logger.info("All agents stopped.")
     
-    def run(self):
+    def request_shutdown(self):
+        """Stop supervising and unwind run() so agents get shut down."""
+        self.running = False
+        if self._main_task is not None:
+            self._main_task.cancel()
+    
+    async def run(self):
         """Run the agent launcher."""
+        self._main_task = asyncio.current_task()
+        loop = asyncio.get_running_loop()
+        use_pidfd_child_watcher()
+        
+        # Handle signals for clean shutdown
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.request_shutdown)
+        
         try:
-            self.start_all_agents()
-            self.monitor_agents()
-        except KeyboardInterrupt:
+            await self.start_all_agents()
+            await self.monitor_agents()
+        except asyncio.CancelledError:
             logger.info("\nShutdown requested...")
         finally:
             self.running = False
-            self.stop_all_agents()
+            await self.stop_all_agents()
 
 
 def main():
@@ -212,15 +240,8 @@ def main():
     
     launcher = AgentLauncher()
     
-    # Handle signals for clean shutdown
-    def signal_handler(sig, frame):
-        launcher.running = False
-    
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
-    
     # Run the launcher
-    launcher.run()
+    asyncio.run(launcher.run())
 
 
 if __name__ == "__main__":
@@ -2,15 +2,20 @@
 Launch all travel agents with security enabled.
 """
 import asyncio
-import subprocess
+import base64
+import secrets
 import sys
-import time
 import os
 import signal
-from typing import List, Dict
+from typing import List, Dict, Optional, Set
 import logging
 from dotenv import load_dotenv
 
+try:
+    from .shared.supervisor import supervise, use_pidfd_child_watcher
+except ImportError:  # run as a script (python src/launch_secure.py)
+    from shared.supervisor import supervise, use_pidfd_child_watcher
+
 
 load_dotenv()
 logging.basicConfig(level=logging.INFO)
@@ -57,98 +62,168 @@ AGENTS = {
     }
 }
 
+# Random bytes per generated API key
+API_KEY_BYTES = 32
+
+# Per-agent stdout/stderr logs; children write straight to these files
+AGENT_LOG_DIR = os.getenv("AGENT_LOG_DIR", "logs")
+# Lines of an agent's log reported when it fails to start
+FAILED_START_LOG_LINES = 50
+
+# Readiness probe: an agent is up once its port accepts connections
+AGENT_READY_TIMEOUT = float(os.getenv("AGENT_READY_TIMEOUT", "30"))
+AGENT_READY_POLL_INTERVAL = 0.1
+
 
 class SecureAgentLauncher:
     """Manages launching and monitoring agent processes with security."""
     
     def __init__(self):
-        self.processes: Dict[str, subprocess.Popen] = {}
+        self.processes: Dict[str, asyncio.subprocess.Process] = {}
         self.running = True
+        self._main_task: Optional[asyncio.Task] = None
         self._generate_api_keys()
         self._setup_ssl_certificates()
+        
+        # Ports are fixed for the launcher's lifetime, so resolve them once
+        self.resolved_ports: Dict[str, int] = {
+            agent_id: int(os.getenv(config["env_var"], config["port"]))
+            for agent_id, config in AGENTS.items()
+        }
+        
+        # Snapshot the environment (including generated keys) once and build
+        # each agent's env from it, rather than copying os.environ per spawn
+        self.base_env: Dict[str, str] = {**os.environ, "USE_SSL": "true"}
+        self.agent_envs: Dict[str, Dict[str, str]] = {
+            agent_id: {**self.base_env, config["env_var"]: str(self.resolved_ports[agent_id])}
+            for agent_id, config in AGENTS.items()
+        }
     
     def _generate_api_keys(self):
         """Generate API keys for inter-agent communication if not set."""
         services = ["orchestrator", "hotel", "transport", "budget", "activity", "itinerary", "client"]
+        missing = [service for service in services if not os.getenv(f"{service.upper()}_API_KEY")]
         
-        for service in services:
-            env_var = f"{service.upper()}_API_KEY"
-            if not os.getenv(env_var):
-                # Generate a secure API key
-                import secrets
-                api_key = f"{service}-{secrets.token_urlsafe(32)}"
-                os.environ[env_var] = api_key
-                logger.info(f"Generated API key for {service}")
+        # One read from the OS CSPRNG, sliced into a key per service
+        raw = secrets.token_bytes(API_KEY_BYTES * len(missing))
+        
+        for i, service in enumerate(missing):
+            chunk = raw[i * API_KEY_BYTES:(i + 1) * API_KEY_BYTES]
+            token = base64.urlsafe_b64encode(chunk).rstrip(b"=").decode()
+            os.environ[f"{service.upper()}_API_KEY"] = f"{service}-{token}"
+            logger.info(f"Generated API key for {service}")
     
     def _setup_ssl_certificates(self):
-        """Ensure SSL certificates exist."""
-        cert_dir = "certs"
-        cert_file = os.path.join(cert_dir, "server.crt")
-        key_file = os.path.join(cert_dir, "server.key")
+        """Ensure SSL certificates exist before any agent starts."""
+        # Imported here: it pulls in the crypto stack the launcher otherwise skips
+        try:
+            from .security.auth import ensure_self_signed_cert
+        except ImportError:  # run as a script (python src/launch_secure.py)
+            from security.auth import ensure_self_signed_cert
         
-        if not os.path.exists(cert_file) or not os.path.exists(key_file):
-            logger.info("SSL certificates not found. They will be generated on first run.")
-            os.makedirs(cert_dir, exist_ok=True)
+        cert_file = os.getenv("SSL_CERT_FILE", "certs/server.crt")
+        key_file = os.getenv("SSL_KEY_FILE", "certs/server.key")
+        
+        # Generate once here so the agents only ever load the shared files
+        if ensure_self_signed_cert(cert_file, key_file):
+            logger.info(f"Generated self-signed SSL certificate: {cert_file}")
     
-    def start_agent(self, agent_id: str, config: Dict) -> subprocess.Popen:
+    async def start_agent(self, agent_id: str, config: Dict) -> asyncio.subprocess.Process:
         """Start a single agent process with security enabled."""
         agent_name = config["name"]
         module = config["module"]
-        port = os.getenv(config["env_var"], config["port"])
+        port = self.resolved_ports[agent_id]
         
         logger.info(f"Starting {agent_name} on port {port} (HTTPS)...")
         
-        # Set environment variable for port
-        env = os.environ.copy()
-        env[config["env_var"]] = str(port)
-        
-        # Ensure SSL is enabled
-        env["USE_SSL"] = "true"
-        
-        # Launch the agent
-        process = subprocess.Popen(
-            [sys.executable, "-m", module],
-            env=env,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
-            universal_newlines=True
-        )
+        # Send the agent's output to its own log file; an unread pipe would
+        # eventually fill up and block the agent
+        os.makedirs(AGENT_LOG_DIR, exist_ok=True)
+        log_path = os.path.join(AGENT_LOG_DIR, f"{agent_id}.log")
+        log_fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            log_start = os.lseek(log_fd, 0, os.SEEK_END)
+            
+            # Launch the agent
+            # close_fds=False lets subprocess use posix_spawn instead of
+            # fork+exec; the launcher's own fds are non-inheritable anyway
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, "-m", module,
+                env=self.agent_envs[agent_id],
+                stdout=log_fd,
+                stderr=asyncio.subprocess.STDOUT,
+                close_fds=False
+            )
+        finally:
+            os.close(log_fd)
         
-        # Give it a moment to start
-        time.sleep(3)
+        # Track it right away so a shutdown during startup still stops it
+        self.processes[agent_id] = process
         
-        # Check if it started successfully
-        if process.poll() is None:
+        # Wait until the port accepts connections instead of sleeping
+        if await self.wait_ready(process, port):
             logger.info(f"✓ {agent_name} started successfully (PID: {process.pid})")
+        elif process.returncode is None:
+            logger.warning(f"{agent_name} not ready after {AGENT_READY_TIMEOUT}s (PID: {process.pid})")
         else:
-            logger.error(f"✗ {agent_name} failed to start")
-            stdout, stderr = process.communicate()
-            if stdout:
-                logger.error(f"STDOUT: {stdout}")
-            if stderr:
-                logger.error(f"STDERR: {stderr}")
+            logger.error(f"✗ {agent_name} failed to start (log: {log_path})")
+            output = self._read_log_tail(log_path, log_start)
+            if output:
+                logger.error(f"OUTPUT:\n{output}")
         
         return process
     
-    def start_all_agents(self):
-        """Start all agents in the correct order."""
-        # Start agents without dependencies first
-        for agent_id, config in AGENTS.items():
-            if "depends_on" not in config:
-                self.processes[agent_id] = self.start_agent(agent_id, config)
+    @staticmethod
+    def _read_log_tail(log_path: str, offset: int, lines: int = FAILED_START_LOG_LINES) -> str:
+        """Return the last lines an agent wrote to its log since offset."""
+        try:
+            with open(log_path, "rb") as f:
+                f.seek(offset)
+                output = f.read()
+        except OSError:
+            return ""
         
-        # Give base agents time to fully initialize
-        logger.info("Waiting for base agents to initialize...")
-        time.sleep(5)
+        return b"\n".join(output.splitlines()[-lines:]).decode(errors="replace")
+    
+    async def wait_ready(self, process: asyncio.subprocess.Process, port: int,
+                         timeout: float = AGENT_READY_TIMEOUT) -> bool:
+        """Poll the agent's port until it accepts a connection or the agent exits."""
+        deadline = asyncio.get_running_loop().time() + timeout
         
-        # Start agents with dependencies
-        for agent_id, config in AGENTS.items():
-            if "depends_on" in config:
-                logger.info(f"Starting {config['name']} (depends on: {config['depends_on']})")
-                self.processes[agent_id] = self.start_agent(agent_id, config)
-                time.sleep(3)  # Extra time for dependent services
+        while process.returncode is None and asyncio.get_running_loop().time() < deadline:
+            try:
+                _, writer = await asyncio.open_connection("localhost", port)
+            except OSError:
+                await asyncio.sleep(AGENT_READY_POLL_INTERVAL)
+                continue
+            
+            writer.close()
+            await writer.wait_closed()
+            return True
+        
+        return False
+    
+    async def start_all_agents(self):
+        """Start all agents in the correct order."""
+        started: Set[str] = set()
+        remaining = dict(AGENTS)
+        
+        # Boot each wave concurrently once everything it depends on is up
+        while remaining:
+            wave = [
+                agent_id for agent_id, config in remaining.items()
+                if started.issuperset(config.get("depends_on", ()))
+            ]
+            if not wave:
+                raise ValueError(f"Unresolvable agent dependencies: {sorted(remaining)}")
+            
+            for agent_id in wave:
+                config = remaining[agent_id]
+                if "depends_on" in config:
+                    logger.info(f"Starting {config['name']} (depends on: {config['depends_on']})")
+            
+            await asyncio.gather(*(self.start_agent(agent_id, remaining.pop(agent_id)) for agent_id in wave))
+            started.update(wave)
         
         logger.info("\nAll agents started with security enabled!")
         self.print_status()
@@ -159,10 +234,10 @@ class SecureAgentLauncher:
         print("SECURE TRAVEL AGENT SYSTEM STATUS")
         print("="*70)
         
-        for agent_id, config in AGENTS.items():
+        for agent_id, port in self.resolved_ports.items():
+            config = AGENTS[agent_id]
             process = self.processes.get(agent_id)
-            if process and process.poll() is None:
-                port = os.getenv(config["env_var"], config["port"])
+            if process and process.returncode is None:
                 print(f"✓ {config['name']:<20} Running on https://localhost:{port} (PID: {process.pid})")
             else:
                 print(f"✗ {config['name']:<20} Not running")
@@ -174,9 +249,9 @@ class SecureAgentLauncher:
             print(f"- {service.capitalize():<15} {key[:20]}...")
         
         print("\nAccess points:")
-        print(f"- API Gateway:      https://localhost:{AGENTS['api_gateway']['port']}/docs")
-        print(f"- Orchestrator API: https://localhost:{AGENTS['orchestrator']['port']}")
-        print(f"- Hotel Agent API:  https://localhost:{AGENTS['hotel']['port']}")
+        print(f"- API Gateway:      https://localhost:{self.resolved_ports['api_gateway']}/docs")
+        print(f"- Orchestrator API: https://localhost:{self.resolved_ports['orchestrator']}")
+        print(f"- Hotel Agent API:  https://localhost:{self.resolved_ports['hotel']}")
         
         print("\nDemo credentials:")
         print("- Username: demo")
@@ -185,60 +260,64 @@ class SecureAgentLauncher:
         print("\nPress Ctrl+C to stop all agents")
         print("="*70 + "\n")
     
-    def monitor_agents(self):
+    async def monitor_agents(self):
         """Monitor agent processes and restart if needed."""
-        while self.running:
-            try:
-                # Check each agent
-                for agent_id, config in AGENTS.items():
-                    process = self.processes.get(agent_id)
-                    
-                    if process and process.poll() is not None:
-                        # Agent crashed
-                        logger.warning(f"{config['name']} stopped unexpectedly. Restarting...")
-                        self.processes[agent_id] = self.start_agent(agent_id, config)
-                
-                # Wait before next check
-                time.sleep(5)
-                
-            except KeyboardInterrupt:
-                break
+        await asyncio.gather(*(
+            supervise(self, agent_id, config)
+            for agent_id, config in AGENTS.items()
+            if agent_id in self.processes
+        ))
     
-    def stop_all_agents(self):
+    async def stop_all_agents(self):
         """Stop all running agents."""
         logger.info("\nStopping all agents...")
         
-        # Stop in reverse order (API Gateway first, then orchestrator, then agents)
+        # Signal in reverse order (API Gateway first, then orchestrator, then agents)
+        running = {}
         for agent_id in reversed(list(AGENTS.keys())):
             process = self.processes.get(agent_id)
-            if process and process.poll() is None:
-                agent_name = AGENTS[agent_id]["name"]
-                logger.info(f"Stopping {agent_name} (PID: {process.pid})")
-                
-                # Try graceful shutdown first
+            if process and process.returncode is None:
+                logger.info(f"Stopping {AGENTS[agent_id]['name']} (PID: {process.pid})")
                 process.terminate()
-                
-                # Wait up to 5 seconds for graceful shutdown
-                try:
-                    process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    # Force kill if needed
-                    logger.warning(f"Force killing {agent_name}")
-                    process.kill()
-                    process.wait()
+                running[agent_id] = process
+        
+        # Wait for all of them together, up to 5 seconds, for graceful shutdown
+        if running:
+            await asyncio.wait([asyncio.ensure_future(process.wait()) for process in running.values()], timeout=5)
+        
+        # Force kill whatever is still up
+        survivors = [(agent_id, process) for agent_id, process in running.items() if process.returncode is None]
+        for agent_id, process in survivors:
+            logger.warning(f"Force killing {AGENTS[agent_id]['name']}")
+            process.kill()
+        await asyncio.gather(*(process.wait() for _, process in survivors))
         
         logger.info("All agents stopped.")
     
-    def run(self):
+    def request_shutdown(self):
+        """Stop supervising and unwind run() so agents get shut down."""
+        self.running = False
+        if self._main_task is not None:
+            self._main_task.cancel()
+    
+    async def run(self):
         """Run the agent launcher."""
+        self._main_task = asyncio.current_task()
+        loop = asyncio.get_running_loop()
+        use_pidfd_child_watcher()
+        
+        # Handle signals for clean shutdown
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.request_shutdown)
+        
         try:
-            self.start_all_agents()
-            self.monitor_agents()
-        except KeyboardInterrupt:
+            await self.start_all_agents()
+            await self.monitor_agents()
+        except asyncio.CancelledError:
             logger.info("\nShutdown requested...")
         finally:
             self.running = False
-            self.stop_all_agents()
+            await self.stop_all_agents()
 
 
 def main():
@@ -251,15 +330,8 @@ def main():
     
     launcher = SecureAgentLauncher()
     
-    # Handle signals for clean shutdown
-    def signal_handler(sig, frame):
-        launcher.running = False
-    
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
-    
     # Run the launcher
-    launcher.run()
+    asyncio.run(launcher.run())
 
 
 if __name__ == "__main__":
@@ -10,7 +10,9 @@ from .auth import (
     require_api_key,
     require_jwt_token,
     rate_limit,
+    is_trusted_host,
     API_KEY_HEADER,
+    PUBLIC_PATHS,
     SECRET_KEY,
     ALGORITHM,
     ACCESS_TOKEN_EXPIRE_MINUTES,
@@ -26,7 +28,9 @@ __all__ = [
     "require_api_key",
     "require_jwt_token",
     "rate_limit",
+    "is_trusted_host",
     "API_KEY_HEADER",
+    "PUBLIC_PATHS",
     "SECRET_KEY",
     "ALGORITHM",
     "ACCESS_TOKEN_EXPIRE_MINUTES",
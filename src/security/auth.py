@@ -4,13 +4,21 @@ JWT Authentication and Security for A2A Travel Agent System.
 import os
 import jwt
 import hashlib
+import heapq
+import ipaddress
 import secrets
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 import logging
-from functools import wraps
+import time
+from functools import lru_cache, wraps
 import asyncio
 
+try:
+    import fcntl
+except ImportError:  # Windows: certificate generation is not locked
+    fcntl = None
+
 from cryptography.fernet import Fernet
 from passlib.context import CryptContext
 from dotenv import load_dotenv
@@ -25,7 +33,23 @@ SECRET_KEY = os.getenv("JWT_SECRET_KEY", secrets.token_urlsafe(32))
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
+SERVICE_TOKEN_EXPIRE_MINUTES = 60
+# Service tokens are re-minted this long before they expire
+SERVICE_TOKEN_REFRESH_MARGIN = 30
 API_KEY_HEADER = "X-API-Key"
+# Verified tokens remembered by verify_jwt_token until their exp
+JWT_CACHE_MAXSIZE = 4096
+
+# Agent endpoints served without authentication
+PUBLIC_PATHS = frozenset({"/health", "/.well-known/agent.json"})
+
+# Internal networks whose callers skip agent authentication, e.g.
+# A2A_TRUSTED_CIDRS="10.0.0.0/8,127.0.0.1/32"; empty trusts nobody
+TRUSTED_NETWORKS = tuple(
+    ipaddress.ip_network(cidr.strip(), strict=False)
+    for cidr in os.getenv("A2A_TRUSTED_CIDRS", "").split(",")
+    if cidr.strip()
+)
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -42,6 +66,8 @@ class SecurityManager:
         self.service_accounts = self._load_service_accounts()
         self.api_keys = self._load_api_keys()
         self.rate_limits = {}
+        self._jwt_cache: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._jwt_expiry: List[Tuple[float, str]] = []
     
     def _load_service_accounts(self) -> Dict[str, Dict[str, Any]]:
         """Load service accounts for inter-agent communication."""
@@ -100,16 +126,42 @@ class SecurityManager:
         return encoded_jwt
     
     def verify_jwt_token(self, token: str) -> Optional[Dict[str, Any]]:
-        """Verify and decode a JWT token."""
+        """Verify and decode a JWT token, reusing earlier results until exp."""
+        now = time.time()
+        self._evict_expired_tokens(now)
+        
+        # Callers get their own copy so changes never reach the cached claims
+        cached = self._jwt_cache.get(token)
+        if cached is not None:
+            return dict(cached[0])
+        
         try:
             payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            return payload
         except jwt.ExpiredSignatureError:
             logger.warning("JWT token has expired")
             return None
         except jwt.InvalidTokenError as e:
             logger.warning(f"Invalid JWT token: {e}")
             return None
+        
+        # Only tokens that carry an expiry can be dropped on time
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)) and exp > now:
+            if len(self._jwt_cache) >= JWT_CACHE_MAXSIZE:
+                # Drop whichever cached token expires soonest
+                _, oldest = heapq.heappop(self._jwt_expiry)
+                del self._jwt_cache[oldest]
+            self._jwt_cache[token] = (payload, exp)
+            heapq.heappush(self._jwt_expiry, (exp, token))
+        
+        return dict(payload)
+    
+    def _evict_expired_tokens(self, now: float):
+        """Forget cached tokens whose exp has passed."""
+        expiry = self._jwt_expiry
+        while expiry and expiry[0][0] <= now:
+            _, token = heapq.heappop(expiry)
+            del self._jwt_cache[token]
     
     def create_service_token(self, service_id: str) -> str:
         """Create a JWT token for inter-agent communication."""
@@ -124,7 +176,9 @@ class SecurityManager:
             "type": "service"
         }
         
-        return self.create_jwt_token(token_data, expires_delta=timedelta(hours=1))
+        return self.create_jwt_token(
+            token_data, expires_delta=timedelta(minutes=SERVICE_TOKEN_EXPIRE_MINUTES)
+        )
     
     def verify_api_key(self, api_key: str) -> Optional[str]:
         """Verify an API key and return the associated service."""
@@ -151,18 +205,17 @@ class SecurityManager:
     
     def check_rate_limit(self, client_id: str, limit: int = 60) -> bool:
         """Check if client has exceeded rate limit."""
-        now = datetime.now()
-        minute_key = now.strftime("%Y-%m-%d-%H-%M")
-        
-        if client_id not in self.rate_limits:
-            self.rate_limits[client_id] = {}
+        # Fixed one-minute windows on the monotonic clock; each client holds
+        # a single [window, count] pair that is reset when the window rolls
+        window = int(time.monotonic()) // 60
+        entry = self.rate_limits.get(client_id)
         
-        if minute_key not in self.rate_limits[client_id]:
-            self.rate_limits[client_id] = {minute_key: 1}
+        if entry is None or entry[0] != window:
+            self.rate_limits[client_id] = [window, 1]
             return True
         
-        self.rate_limits[client_id][minute_key] += 1
-        return self.rate_limits[client_id][minute_key] <= limit
+        entry[1] += 1
+        return entry[1] <= limit
     
     def generate_session_id(self) -> str:
         """Generate a secure session ID."""
@@ -232,6 +285,18 @@ def rate_limit(requests_per_minute: int = 60):
     return decorator
 
 
+@lru_cache(maxsize=1024)
+def is_trusted_host(host: Optional[str]) -> bool:
+    """Check whether a client address is inside one of the trusted networks."""
+    if not host or not TRUSTED_NETWORKS:
+        return False
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in TRUSTED_NETWORKS)
+
+
 # Security middleware for A2A communication
 class A2ASecurityMiddleware:
     """Middleware to add security to A2A agent communication."""
@@ -239,9 +304,16 @@ class A2ASecurityMiddleware:
     def __init__(self, service_id: str):
         self.service_id = service_id
         self.security_manager = security_manager
+        self._cached_headers: Optional[Tuple[Dict[str, str], float]] = None
     
-    async def add_auth_header(self, headers: Dict[str, str]) -> Dict[str, str]:
-        """Add authentication headers for outgoing requests."""
+    def get_auth_headers(self) -> Dict[str, str]:
+        """Return auth headers, re-minting the service token only near expiry."""
+        cached = self._cached_headers
+        if cached and time.monotonic() < cached[1]:
+            return cached[0]
+        
+        headers = {}
+        
         # Add API key
         service = self.security_manager.service_accounts.get(self.service_id)
         if service:
@@ -251,10 +323,24 @@ class A2ASecurityMiddleware:
         token = self.security_manager.create_service_token(self.service_id)
         headers["Authorization"] = f"Bearer {token}"
         
+        expiry = time.monotonic() + SERVICE_TOKEN_EXPIRE_MINUTES * 60 - SERVICE_TOKEN_REFRESH_MARGIN
+        self._cached_headers = (headers, expiry)
         return headers
     
-    async def verify_incoming_request(self, headers: Dict[str, str]) -> Tuple[bool, Optional[str]]:
-        """Verify authentication for incoming requests."""
+    def invalidate_auth_headers(self):
+        """Drop the cached headers so the next request mints a fresh token."""
+        self._cached_headers = None
+    
+    async def add_auth_header(self, headers: Dict[str, str]) -> Dict[str, str]:
+        """Add authentication headers for outgoing requests."""
+        headers.update(self.get_auth_headers())
+        return headers
+    
+    async def verify_incoming_request(self, headers: Mapping[str, str]) -> Tuple[bool, Optional[str]]:
+        """Verify authentication for incoming requests.
+        
+        Pass the request's own case-insensitive headers rather than a dict copy.
+        """
         # Check API key
         api_key = headers.get(API_KEY_HEADER)
         if api_key:
@@ -316,17 +402,44 @@ def get_ssl_context():
     cert_file = os.getenv("SSL_CERT_FILE", "certs/server.crt")
     key_file = os.getenv("SSL_KEY_FILE", "certs/server.key")
     
-    if os.path.exists(cert_file) and os.path.exists(key_file):
-        context.load_cert_chain(cert_file, key_file)
-    else:
-        logger.warning("SSL certificates not found, generating self-signed certificate")
+    if ensure_self_signed_cert(cert_file, key_file):
         # In production, this should not happen
-        _generate_self_signed_cert(cert_file, key_file)
-        context.load_cert_chain(cert_file, key_file)
+        logger.warning("SSL certificates not found, generated self-signed certificate")
+    context.load_cert_chain(cert_file, key_file)
     
     return context
 
 
+def ensure_self_signed_cert(cert_file: str, key_file: str) -> bool:
+    """Generate a self-signed certificate unless one exists; True if generated."""
+    if os.path.exists(cert_file) and os.path.exists(key_file):
+        return False
+    
+    cert_dir = os.path.dirname(cert_file) or "."
+    os.makedirs(cert_dir, exist_ok=True)
+    
+    # Agents started together would otherwise each generate (and overwrite) a key
+    with open(os.path.join(cert_dir, ".lock"), "w") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        
+        # Someone else may have generated it while we waited for the lock
+        if os.path.exists(cert_file) and os.path.exists(key_file):
+            return False
+        
+        _generate_self_signed_cert(cert_file, key_file)
+        return True
+
+
+def _write_atomic(path: str, data: bytes, mode: int = 0o644):
+    """Write a file so readers never see it half-written."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
 def _generate_self_signed_cert(cert_file: str, key_file: str):
     """Generate self-signed certificate for development."""
     from cryptography import x509
@@ -373,14 +486,10 @@ def _generate_self_signed_cert(cert_file: str, key_file: str):
     # Create directories if needed
     os.makedirs(os.path.dirname(cert_file), exist_ok=True)
     
-    # Write private key
-    with open(key_file, "wb") as f:
-        f.write(key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.TraditionalOpenSSL,
-            encryption_algorithm=serialization.NoEncryption()
-        ))
-    
-    # Write certificate
-    with open(cert_file, "wb") as f:
-        f.write(cert.public_bytes(serialization.Encoding.PEM))
\ No newline at end of file
+    # Write private key, then certificate; both appearing means both are complete
+    _write_atomic(key_file, key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.TraditionalOpenSSL,
+        encryption_algorithm=serialization.NoEncryption()
+    ), mode=0o600)
+    _write_atomic(cert_file, cert.public_bytes(serialization.Encoding.PEM))
@@ -0,0 +1,55 @@
+"""
+Agent process supervision shared by the launchers.
+"""
+import asyncio
+import logging
+import os
+import sys
+from typing import Dict
+
+
+logger = logging.getLogger(__name__)
+
+
+# An agent that exits sooner than this after (re)starting is crash-looping,
+# so its next restart is delayed until this long after the previous one
+RESTART_RETRY_SECONDS = 5
+
+
+def use_pidfd_child_watcher():
+    """Have child exits wake the event loop through pidfds where supported.
+    
+    The loop then learns about an exited agent from the same epoll it already
+    waits on, instead of from a helper thread per child. Python 3.12+ does
+    this by default; platforms without pidfd_open keep the default watcher.
+    """
+    if sys.version_info < (3, 12) and hasattr(os, "pidfd_open"):
+        watcher = asyncio.PidfdChildWatcher()
+        # Must be called from the running loop the agents are spawned on
+        watcher.attach_loop(asyncio.get_running_loop())
+        asyncio.set_child_watcher(watcher)
+
+
+async def supervise(launcher, agent_id: str, config: Dict):
+    """Restart an agent as soon as its process exits, backing off on crash loops.
+    
+    ``launcher`` provides ``running``, ``processes`` and ``start_agent``.
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    
+    while launcher.running:
+        # Woken by the child's exit rather than by polling
+        await launcher.processes[agent_id].wait()
+        if not launcher.running:
+            break
+        
+        uptime = loop.time() - started
+        if uptime < RESTART_RETRY_SECONDS:
+            await asyncio.sleep(RESTART_RETRY_SECONDS - uptime)
+            if not launcher.running:
+                break
+        
+        logger.warning(f"{config['name']} stopped unexpectedly. Restarting...")
+        started = loop.time()
+        await launcher.start_agent(agent_id, config)
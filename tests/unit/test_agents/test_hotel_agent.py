@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from src.agents.hotel.hotel_agent_a2a import HotelAgentA2A, search_hotels
+from src.agents.hotel.tools import HotelValidator
 
 
 class TestHotelAgent:
@@ -165,4 +166,29 @@ class TestHotelAgentTools:
             hotel = data["hotels"][0]
             assert "amenities" in hotel
             assert isinstance(hotel["amenities"], list)
-            assert len(hotel["amenities"]) > 0
\ No newline at end of file
+            assert len(hotel["amenities"]) > 0
+
+
+class TestHotelValidator:
+    """Test cases for hotel availability validation."""
+    
+    @pytest.mark.asyncio
+    async def test_validate_availability_many_preserves_order(self):
+        """Test that batch validation returns one result per hotel, in order."""
+        hotels = [
+            {"name": "Roomy", "available_rooms": 5},
+            {"name": "Full", "available_rooms": 0},
+            {"name": "Small", "available_rooms": 1},
+        ]
+        check_in = datetime(2025, 8, 15)
+        check_out = datetime(2025, 8, 20)
+        
+        with patch("src.agents.hotel.tools._VRNG.random", return_value=0.0):
+            results = await HotelValidator.validate_availability_many(
+                hotels, check_in, check_out, guests=4, max_concurrency=2
+            )
+        
+        assert len(results) == 3
+        assert results[0] == (True, None)
+        assert results[1] == (False, "All rooms are booked")
+        assert results[2][0] is False
@@ -0,0 +1,201 @@
+"""
+Unit tests for Itinerary Agent tools.
+"""
+import pytest
+import json
+
+from src.agents.itinerary.itinerary_agent_a2a import (
+    check_scheduling_conflicts,
+    compile_and_check,
+    compile_itinerary,
+    _format_event,
+)
+
+
+class TestSchedulingConflicts:
+    """Test cases for check_scheduling_conflicts."""
+
+    @pytest.mark.asyncio
+    async def test_detects_overlap_spanning_multiple_bookings(self):
+        """A long booking conflicts with every booking that starts before it ends."""
+        bookings = [
+            {"name": "Day tour", "date": "2025-08-15", "time": "09:00", "duration_hours": 6},
+            {"name": "Lunch", "date": "2025-08-15", "time": "12:00", "duration_hours": 1},
+            {"name": "Museum", "date": "2025-08-15", "time": "13:30", "duration_hours": 1},
+        ]
+
+        result = await check_scheduling_conflicts.ainvoke({"bookings": bookings})
+        data = json.loads(result)
+
+        pairs = {(c["booking1"], c["booking2"]) for c in data["conflicts"]}
+        assert ("Day tour", "Lunch") in pairs
+        assert ("Day tour", "Museum") in pairs
+
+    @pytest.mark.asyncio
+    async def test_double_booking_and_separate_days(self):
+        """Same start time is a double booking; different days never conflict."""
+        bookings = [
+            {"name": "Dinner A", "date": "2025-08-15", "time": "19:00"},
+            {"name": "Dinner B", "date": "2025-08-15", "time": "19:00"},
+            {"name": "Dinner C", "date": "2025-08-16", "time": "19:00"},
+        ]
+
+        result = await check_scheduling_conflicts.ainvoke({"bookings": bookings})
+        data = json.loads(result)
+
+        assert data["conflicts_found"] == 1
+        assert data["conflicts"][0]["type"] == "double_booking"
+
+    @pytest.mark.asyncio
+    async def test_respects_buffer(self):
+        """Bookings separated by at least the buffer do not conflict."""
+        bookings = [
+            {"name": "Tour", "date": "2025-08-15", "time": "09:00", "duration_hours": 2},
+            {"name": "Lunch", "date": "2025-08-15", "time": "11:30", "duration_hours": 1},
+        ]
+
+        result = await check_scheduling_conflicts.ainvoke(
+            {"bookings": bookings, "buffer_minutes": 30}
+        )
+        data = json.loads(result)
+
+        assert data["conflicts_found"] == 0
+
+
+class TestCompileItinerary:
+    """Test cases for compile_itinerary."""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_bookings_are_dropped(self):
+        """A retried booking with the same identity is only counted once."""
+        booking = {
+            "booking_type": "hotel",
+            "name": "Hotel Gracery Shinjuku",
+            "confirmation_number": "HTL123",
+            "date": "2025-08-15",
+            "time": "15:00",
+            "location": "Shinjuku, Tokyo",
+            "cost": 180.0,
+        }
+
+        result = await compile_itinerary.ainvoke({
+            "trip_name": "Tokyo",
+            "start_date": "2025-08-15",
+            "end_date": "2025-08-16",
+            "destination": "Tokyo",
+            "travelers": 1,
+            "bookings": [booking, dict(booking)],
+        })
+        data = json.loads(result)
+
+        assert data["booking_count"] == 1
+        assert data["total_cost"] == 180.0
+        assert len(data["days"][0]["events"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_incomplete_booking_uses_defaults(self):
+        """A booking without cost or location is still compiled."""
+        result = await compile_itinerary.ainvoke({
+            "trip_name": "Tokyo",
+            "start_date": "2025-08-15",
+            "end_date": "2025-08-15",
+            "destination": "Tokyo",
+            "travelers": 1,
+            "bookings": [
+                {"booking_type": "activity", "name": "Walk", "date": "2025-08-15", "time": "10:00"},
+                {"booking_type": "hotel", "name": "Hotel", "date": "2025-08-15",
+                 "location": "Shinjuku", "cost": 180.0},
+            ],
+        })
+        data = json.loads(result)
+
+        assert "error" not in data
+        assert data["total_cost"] == 180.0
+        assert data["days"][0]["events"][1]["location"] == ""
+
+    @pytest.mark.asyncio
+    async def test_loosely_typed_booking_fields(self):
+        """Numeric confirmation numbers and null costs or locations are accepted."""
+        result = await compile_itinerary.ainvoke({
+            "trip_name": "Tokyo",
+            "start_date": "2025-08-15",
+            "end_date": "2025-08-15",
+            "destination": "Tokyo",
+            "travelers": 1,
+            "bookings": [
+                {"booking_type": "hotel", "name": "Hotel", "date": "2025-08-15",
+                 "confirmation_number": 12345, "cost": None, "location": None},
+                {"booking_type": "activity", "name": "Tour", "date": "2025-08-15",
+                 "time": "10:00", "cost": "120"},
+            ],
+        })
+        data = json.loads(result)
+
+        assert "error" not in data
+        assert data["total_cost"] == 120.0
+        hotel = data["days"][0]["events"][0]
+        assert hotel["confirmation"] == "12345"
+        assert hotel["location"] == ""
+
+    @pytest.mark.asyncio
+    async def test_events_sorted_by_unpadded_time(self):
+        """Unpadded hours sort by time and no sort helper leaks into the result."""
+        result = await compile_itinerary.ainvoke({
+            "trip_name": "Paris",
+            "start_date": "2025-08-15",
+            "end_date": "2025-08-15",
+            "destination": "Paris",
+            "travelers": 1,
+            "bookings": [
+                {"booking_type": "activity", "name": "Museum", "date": "2025-08-15", "time": "9:30"},
+                {"booking_type": "restaurant", "name": "Breakfast", "date": "2025-08-15", "time": "08:00"},
+            ],
+        })
+        events = json.loads(result)["days"][0]["events"]
+
+        assert [e["name"] for e in events] == ["Breakfast", "Museum"]
+        assert all("_sort_key" not in e for e in events)
+
+
+class TestCompileAndCheck:
+    """Test cases for compile_and_check."""
+
+    @pytest.mark.asyncio
+    async def test_returns_itinerary_and_conflicts(self):
+        """Both tool results are returned together."""
+        bookings = [
+            {"booking_type": "activity", "name": "Tour", "date": "2025-08-15",
+             "time": "10:00", "location": "Louvre", "cost": 40.0, "duration_hours": 2},
+            {"booking_type": "restaurant", "name": "Lunch", "date": "2025-08-15",
+             "time": "11:30", "location": "Le Marais", "cost": 60.0},
+        ]
+
+        result = await compile_and_check.ainvoke({
+            "trip_name": "Paris",
+            "start_date": "2025-08-15",
+            "end_date": "2025-08-15",
+            "destination": "Paris",
+            "travelers": 2,
+            "bookings": bookings,
+        })
+        data = json.loads(result)
+
+        assert data["itinerary"]["total_cost"] == 100.0
+        assert data["conflict_check"]["conflicts_found"] == 1
+        assert data["conflict_check"]["conflicts"][0]["type"] == "timing_conflict"
+
+
+class TestFormatEvent:
+    """Test cases for _format_event."""
+
+    def test_omits_empty_fields(self):
+        """Only the fields an event has are rendered."""
+        text = _format_event({"time": "10:00", "name": "Tour", "location": "Louvre", "cost": 0})
+
+        assert text == "\n**10:00** - Tour\n📍 Louvre"
+
+    def test_missing_time_renders_as_all_day(self):
+        """An event without a time is shown as all day."""
+        text = _format_event({"time": None, "name": "Hotel", "cost": 180})
+
+        assert text == "\n**All day** - Hotel\n💰 Cost: $180.00"
@@ -0,0 +1,193 @@
+"""
+Unit tests for Orchestrator Agent tools.
+"""
+import pytest
+import asyncio
+import itertools
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+from src.agents.orchestrator.orchestrator_a2a import OrchestratorAgentA2A
+from src.agents.orchestrator import remote_agent_connection
+from src.agents.orchestrator.remote_agent_connection import (
+    RemoteAgentConnection,
+    RemoteAgentManager,
+)
+from src.agents.orchestrator.tools import DependencyManager
+
+
+class TestOrchestratorTools:
+    """Test cases for the orchestrator's tools."""
+
+    @pytest.fixture
+    def orchestrator(self):
+        """Create an orchestrator without an LLM or live agent connections."""
+        orchestrator = OrchestratorAgentA2A.__new__(OrchestratorAgentA2A)
+        orchestrator.remote_manager = MagicMock(version=0, connections={})
+        orchestrator.remote_manager.get_connection.return_value = None
+        orchestrator._id_pool = bytearray()
+        orchestrator._id_off = 0
+        orchestrator._task_counter = itertools.count(1)
+        return orchestrator
+
+    @pytest.mark.asyncio
+    async def test_send_task_to_unknown_agent(self, orchestrator):
+        """Test that an unknown agent is reported as JSON."""
+        send_task = orchestrator._create_send_task_tool()
+
+        result = await send_task.ainvoke({"agent_name": "Nope_Agent", "task": "Find a hotel"})
+        data = json.loads(result)
+
+        assert "Nope_Agent not found" in data["error"]
+
+    @pytest.mark.asyncio
+    async def test_send_task_reports_communication_error(self, orchestrator):
+        """Test that a failed send is reported instead of raised."""
+        connection = MagicMock()
+        connection.send_message = AsyncMock(side_effect=RuntimeError("agent down"))
+        orchestrator.remote_manager.get_connection.return_value = connection
+        send_task = orchestrator._create_send_task_tool()
+
+        result = await send_task.ainvoke({"agent_name": "Hotel_Agent", "task": "Find a hotel"})
+        data = json.loads(result)
+
+        assert data["agent"] == "Hotel_Agent"
+        assert "agent down" in data["error"]
+
+    @pytest.mark.asyncio
+    async def test_analyze_agent_responses(self, orchestrator):
+        """Test that responses are summarised per agent type."""
+        analyze = orchestrator._create_analyze_responses_tool()
+
+        result = await analyze.ainvoke({"responses": [
+            {"agent": "Hotel_Agent", "response": "Booked"},
+            {"agent": "Transport_Agent", "response": "Booked"},
+        ]})
+        data = json.loads(result)
+
+        assert data["hotels_found"] == 1
+        assert data["transport_found"] == 1
+        assert data["recommendations"]
+
+
+class TestRemoteAgentConnection:
+    """Test cases for the queued sender of RemoteAgentConnection."""
+
+    @pytest.fixture
+    def connection(self):
+        """Create a connection whose sends are stubbed out."""
+        connection = RemoteAgentConnection.__new__(RemoteAgentConnection)
+        connection.url = "http://localhost:10010"
+        connection._owns_client = False
+        connection._send_queue = asyncio.Queue()
+        connection._flusher = None
+        connection._in_flight = set()
+        return connection
+
+    @pytest.mark.asyncio
+    async def test_single_send_is_not_delayed(self, connection):
+        """Test that a lone message is sent without waiting for a batch."""
+        connection.send_message_batch = AsyncMock(return_value=["ok"])
+        # A batching window long enough that waiting on it would time out
+        connection._flusher = asyncio.create_task(connection._flush_loop(max_delay=10))
+
+        result = await asyncio.wait_for(connection.send_message(MagicMock()), timeout=1)
+
+        assert result == "ok"
+        await connection.close()
+
+    @pytest.mark.asyncio
+    async def test_send_is_not_blocked_by_in_flight_send(self, connection):
+        """Test that a later message goes out while an earlier one is still running."""
+        release = asyncio.Event()
+
+        async def send_batch(requests, return_exceptions=False):
+            if requests[0] == "slow":
+                await release.wait()
+            return requests
+
+        connection.send_message_batch = send_batch
+        slow = asyncio.create_task(connection.send_message("slow"))
+        await asyncio.sleep(0.01)
+
+        result = await asyncio.wait_for(connection.send_message("fast"), timeout=1)
+
+        assert result == "fast"
+        assert not slow.done()
+        release.set()
+        assert await slow == "slow"
+        await connection.close()
+
+    @pytest.mark.asyncio
+    async def test_close_fails_pending_sends(self, connection):
+        """Test that closing the connection does not leave senders waiting."""
+        async def never_returns(requests, return_exceptions=False):
+            await asyncio.Event().wait()
+
+        connection.send_message_batch = never_returns
+        sends = [asyncio.create_task(connection.send_message(MagicMock())) for _ in range(3)]
+        await asyncio.sleep(0.01)
+
+        await connection.close()
+        results = await asyncio.gather(*sends, return_exceptions=True)
+
+        assert all(isinstance(result, ConnectionError) for result in results)
+
+
+class TestRemoteAgentManager:
+    """Test cases for RemoteAgentManager."""
+
+    @pytest.fixture
+    def resolver(self, monkeypatch):
+        """Replace the card resolver with one that returns a placeholder card."""
+        resolver = MagicMock()
+        resolver.return_value.get_agent_card = AsyncMock(return_value="card")
+        monkeypatch.setattr(remote_agent_connection, "A2ACardResolver", resolver)
+        return resolver
+
+    @pytest.mark.asyncio
+    async def test_client_reopens_after_close_all(self, resolver):
+        """Test that agents can be added again after close_all()."""
+        manager = RemoteAgentManager()
+        await manager.close_all()
+
+        await manager.add_agent("http://localhost:10010")
+
+        client = resolver.call_args.args[0]
+        assert client is manager._client
+        assert not client.is_closed
+
+
+class TestDependencyManager:
+    """Test cases for DependencyManager."""
+
+    def test_execution_order_is_not_shared(self):
+        """Test that changing a returned order leaves the next one intact."""
+        manager = DependencyManager()
+
+        order = manager.get_execution_order()
+        order[0].clear()
+        order.append(["unknown"])
+
+        assert manager.get_execution_order() == [
+            ["hotel", "transport", "budget"], ["activity"], ["itinerary"]
+        ]
+
+    def test_mark_complete_wakes_dependents(self):
+        """Test that an agent becomes ready once all its dependencies complete."""
+        manager = DependencyManager()
+        progress = manager.new_progress()
+
+        assert manager.mark_complete("hotel", progress) == ["activity"]
+        assert manager.mark_complete("hotel", progress) == []
+        assert manager.mark_complete("transport", progress) == []
+        assert manager.mark_complete("activity", progress) == ["itinerary"]
+
+    def test_sessions_track_progress_separately(self):
+        """Test that completions in one session do not affect another."""
+        manager = DependencyManager()
+        first, second = manager.new_progress(), manager.new_progress()
+
+        manager.mark_complete("hotel", first)
+
+        assert manager.mark_complete("hotel", second) == ["activity"]
@@ -0,0 +1,67 @@
+"""
+Unit tests for Transport Agent tools.
+"""
+import pytest
+import json
+
+from src.agents.transport.transport_agent_a2a import search_flights
+
+
+class TestSearchFlights:
+    """Test cases for search_flights."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_search_is_served_from_cache(self):
+        """An identical query returns the same options without regenerating them."""
+        query = {
+            "origin": "London",
+            "destination": "Paris",
+            "departure_date": "2025-08-15",
+            "passengers": 2,
+            "class_type": "economy",
+            "max_budget": 5000.0,
+        }
+
+        first = await search_flights.ainvoke(query)
+        second = await search_flights.ainvoke(query)
+
+        assert first == second
+        assert json.loads(first)["found"] > 0
+
+    @pytest.mark.asyncio
+    async def test_invalid_date_returns_error(self):
+        """A malformed date produces an error payload."""
+        query = {
+            "origin": "Tokyo",
+            "destination": "Osaka",
+            "departure_date": "not-a-date",
+            "max_budget": 1000.0,
+        }
+
+        data = json.loads(await search_flights.ainvoke(query))
+
+        assert "error" in data
+
+    @pytest.mark.asyncio
+    async def test_train_alternative_for_rail_pair_in_any_case(self):
+        """Rail pairs match in either direction and regardless of case."""
+        data = json.loads(await search_flights.ainvoke({
+            "origin": "paris",
+            "destination": "london",
+            "departure_date": "2025-09-01",
+            "max_budget": 2000.0,
+        }))
+
+        assert [alt["mode"] for alt in data["alternatives"]] == ["train"]
+
+    @pytest.mark.asyncio
+    async def test_no_train_alternative_for_same_city(self):
+        """A city is not a rail pair with itself."""
+        data = json.loads(await search_flights.ainvoke({
+            "origin": "London",
+            "destination": "London",
+            "departure_date": "2025-09-01",
+            "max_budget": 2000.0,
+        }))
+
+        assert data["alternatives"] == []
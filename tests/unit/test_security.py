@@ -10,7 +10,8 @@ from src.security.auth import (
     SecurityManager,
     A2ASecurityMiddleware,
     SecureConfig,
-    API_KEY_HEADER
+    API_KEY_HEADER,
+    ensure_self_signed_cert
 )
 
 
@@ -68,6 +69,39 @@ class TestSecurityManager:
         result = security_manager.verify_jwt_token("invalid.token.here")
         assert result is None
     
+    def test_verify_jwt_token_cached(self, security_manager):
+        """Test that a repeated token skips signature verification."""
+        token = security_manager.create_jwt_token({"sub": "test-user"})
+        first = security_manager.verify_jwt_token(token)
+        
+        with patch("src.security.auth.jwt.decode") as mock_decode:
+            second = security_manager.verify_jwt_token(token)
+        
+        mock_decode.assert_not_called()
+        assert second == first
+    
+    def test_verify_jwt_token_cached_payload_is_not_shared(self, security_manager):
+        """Test that changing a verified payload does not affect later verifications."""
+        token = security_manager.create_jwt_token({"sub": "test-user"})
+        
+        security_manager.verify_jwt_token(token)["sub"] = "first-caller"
+        security_manager.verify_jwt_token(token)["role"] = "admin"
+        
+        payload = security_manager.verify_jwt_token(token)
+        assert payload["sub"] == "test-user"
+        assert "role" not in payload
+    
+    def test_verify_jwt_token_cache_evicts_expired(self, security_manager):
+        """Test that cached tokens are dropped once they expire."""
+        token = security_manager.create_jwt_token({"sub": "test-user"})
+        assert security_manager.verify_jwt_token(token) is not None
+        
+        assert token in security_manager._jwt_cache
+        
+        security_manager._evict_expired_tokens(datetime.now(timezone.utc).timestamp() + 3600)
+        assert token not in security_manager._jwt_cache
+        assert not security_manager._jwt_expiry
+    
     def test_create_service_token(self, security_manager):
         """Test creating a service token."""
         token = security_manager.create_service_token("hotel")
@@ -230,4 +264,22 @@ class TestSecureConfig:
     def test_load_nonexistent_config(self):
         """Test loading non-existent config file."""
         result = SecureConfig.load_encrypted_config("nonexistent.enc")
-        assert result == {}
\ No newline at end of file
+        assert result == {}
+
+
+class TestEnsureSelfSignedCert:
+    """Test cases for ensure_self_signed_cert."""
+    
+    def test_generates_only_once(self, tmp_path):
+        """Test that an existing certificate is reused rather than regenerated."""
+        cert_file = str(tmp_path / "certs" / "server.crt")
+        key_file = str(tmp_path / "certs" / "server.key")
+        
+        assert ensure_self_signed_cert(cert_file, key_file) is True
+        
+        with patch("src.security.auth._generate_self_signed_cert") as mock_generate:
+            assert ensure_self_signed_cert(cert_file, key_file) is False
+        
+        mock_generate.assert_not_called()
+        with open(cert_file, "rb") as f:
+            assert f.read().startswith(b"-----BEGIN CERTIFICATE-----")